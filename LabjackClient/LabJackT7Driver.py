@@ -1,5 +1,27 @@
 from labjack import ljm
+import collections
+import contextlib
 import logging
+import math
+import threading
+import time
+
+import numpy as np
+
+from .aggregation import Aggregator
+from .host_statistics import WindowStatistics
+from .instrumentation import InstrumentedLJM, Instrumentation
+from .recording import EndOfRecording, ScanRecorder
+from .ring_buffer import ScanRingBuffer
+from .shared_ring import SharedScanPublisher
+from .supervisor import ConnectionSupervisor, is_connection_error
+
+# Per-scan read frames resolved to Modbus addresses, cached until the channel config changes
+_ReadPlan = collections.namedtuple(
+    "_ReadPlan", ["channels", "keys", "addresses", "data_types", "rms_mask", "scaling_factors"]
+)
+
+logger = logging.getLogger(__name__)
 
 class LabJackT7Driver:
     voltage_ranges = {
@@ -10,80 +32,420 @@ class LabJackT7Driver:
         "-1V": 1.0  # Special case for -1V to 1V range
     }
 
-    def __init__(self, ip_address="172.18.120.132", connection_type="ETHERNET", voltage_range="-1V"):
+    def __init__(self, ip_address="172.18.120.132", connection_type="ETHERNET", voltage_range="-1V", buffer_capacity=None, backend=None,
+                 auto_reconnect=True, reconnect_options=None, instrument=True):
+        self.ljm = backend if backend is not None else ljm  # labjack.ljm or a compatible backend such as SimulatedLJM
+        # Latency histograms and error counters for every ljm call; None when disabled
+        self.instrumentation = Instrumentation() if instrument else None
+        if self.instrumentation is not None:
+            self.ljm = InstrumentedLJM(self.ljm, self.instrumentation)
         self.handle = None
         self.num_analog_inputs = 16  # Default for 16 analog inputs
         self.channel_rms_flags = {}  # Store per-channel RMS flags
         self.channel_types = {}  # Store channel measurement types (single-ended or differential)
         self.channel_scaling_factors = {}  # Store per-channel scaling factors
+        self.channel_ranges = {}  # Store per-channel voltage ranges
+        self.channel_negative_channels = {}  # Store per-channel AIN#_NEGATIVE_CH values
+        self.channel_resolution_indices = {}  # Store per-channel resolution indices
+        self.channel_rms_settings = {}  # Store per-channel FlexRMS (num_scans, scan_time_microseconds)
         self.voltage_range = voltage_range
         self.ip_address = ip_address
         self.connection_type = connection_type
         self.resolution_index = 0  # Auto-resolution by default
 
+        # Configuration transaction state
+        self._register_cache = {}  # Last known device value of each configuration register
+        self._staged_writes = []  # (name, value) frames waiting for commit(), in order
+        self._transaction_depth = 0
+        # Guards the transaction state and register cache, which the supervisor's reconnect
+        # (start() on its own thread) shares with the setters
+        self._config_lock = threading.RLock()
+
+        # Register name -> (address, data_type), resolved once; per-scan read frames
+        self._register_addresses = {}
+        self._read_plan = None
+
+        # Optional ring buffer that every acquired scan is written into
+        self.buffer = None
+        if buffer_capacity:
+            self.enable_buffer(buffer_capacity)
+
+        # Background reconnection with backoff; None falls back to synchronous restart_device()
+        self.supervisor = ConnectionSupervisor(self, **(reconnect_options or {})) if auto_reconnect else None
+
+        # Optional binary recording of every acquired scan
+        self.recorder = None
+
+        # Optional shared memory ring other local processes read scans from
+        self.publisher = None
+
+        # Optional reduction of acquired scans into fixed windows
+        self.aggregator = None
+
+        # Held while scans are written to the outputs above, so an output can be detached
+        # and closed without a concurrent write still using it
+        self._outputs_lock = threading.Lock()
+
+        # Streaming state
+        self.stream_channels = []  # Channels in the active stream scan list, in scan order
+        self.stream_scan_rate = None  # Actual scan rate reported by eStreamStart
+        self.stream_start_time = None  # time.time() at eStreamStart, the timestamp of the first scan
+        self._stream_blocks = None  # Buffered (timestamp, data) blocks from eStreamRead
+        self._stream_lock = threading.Lock()
+        self._stream_data_ready = threading.Condition(self._stream_lock)
+        self._stream_stop_event = threading.Event()
+        self._stream_thread = None
+        self._stream_status = {}
+        self._stream_args = None  # start_stream() arguments, kept to resume the stream after a reconnect
+        self._host_statistics = None  # WindowStatistics over streamed RMS channels, if enabled
+
+        # Opt-in per-scan DEBUG trace of read_samples() values, see enable_sample_trace()
+        self._sample_trace_every = None
+        self._sample_trace_interval = 0.0
+        self._sample_trace_scans = 0
+        self._sample_trace_last = None
+
 
     def set_scaling_factor(self, channel, scaling_factor):
         self.channel_scaling_factors[channel] = scaling_factor
-        logging.info(f"Set scaling factor for AIN{channel} to {scaling_factor}")
+        self._invalidate_read_plan()
+        logger.info("Set scaling factor for AIN%s to %s", channel, scaling_factor)
+
+
+    def enable_buffer(self, capacity):
+        """
+        Allocate a fixed-capacity ring buffer that read_samples() and the stream reader
+        write into. Rows are indexed by channel number; memory use is
+        2 * capacity * (num_analog_inputs + 1) * 8 bytes.
+
+        :param capacity: Number of samples kept per channel
+        :return: The ScanRingBuffer instance
+        """
+        self.buffer = ScanRingBuffer(capacity, self.num_analog_inputs)
+        logger.info("Allocated ring buffer for %s samples (%s bytes)", capacity, self.buffer.nbytes)
+        return self.buffer
+
+    def start_recording(self, path, dtype="float32"):
+        """
+        Record every scan acquired by read_samples() or the stream reader to an append-only
+        binary file (see recording.ScanRecorder). The header stores the channel config
+        (range, negative channel, scaling factor, RMS flag) for each of the analog inputs.
+
+        :param path: Output file path
+        :param dtype: "float32" or "float64" sample values
+        :return: The ScanRecorder instance
+        """
+        channels = [
+            {
+                "channel": channel,
+                "name": f"AIN{channel}",
+                "range": self.channel_ranges.get(channel, self.voltage_range),
+                "negative_channel": self.channel_negative_channels.get(channel, 199),
+                "scaling_factor": self.channel_scaling_factors.get(channel, 1),
+                "rms": bool(self.channel_rms_flags.get(channel, False)),
+            }
+            for channel in range(self.num_analog_inputs)
+        ]
+        metadata = {"ip_address": self.ip_address, "created": time.time()}
+        self.recorder = ScanRecorder(path, channels, dtype=dtype, metadata=metadata)
+        logger.info("Recording scans to %s", path)
+        return self.recorder
+
+    def stop_recording(self):
+        with self._outputs_lock:
+            recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close()
+            logger.info("Stopped recording after %s scans", recorder.records_written)
+
+    def start_publishing(self, capacity, name=None):
+        """
+        Publish every scan acquired by read_samples() or the stream reader to a shared
+        memory ring (see shared_ring.SharedScanPublisher). Other processes on the host
+        attach with SharedScanSubscriber(name) and read the scans without touching the
+        device. Rows are indexed by channel number, as in the ring buffer.
+
+        :param capacity: Number of scans kept per channel
+        :param name: Shared memory name; None picks a unique one
+        :return: The SharedScanPublisher instance; subscribers attach by its name attribute
+        """
+        self.publisher = SharedScanPublisher(capacity, self.num_analog_inputs, name=name)
+        logger.info("Publishing scans to shared memory %s (%s bytes)", self.publisher.name, self.publisher.nbytes)
+        return self.publisher
+
+    def stop_publishing(self):
+        with self._outputs_lock:
+            publisher, self.publisher = self.publisher, None
+        if publisher is not None:
+            logger.info("Stopped publishing after %s scans", publisher.total_written)
+            publisher.close()
 
+    def start_aggregation(self, windows, channels=None, on_windows=None, sinks=None):
+        """
+        Reduce every scan acquired by read_samples() or the stream reader into fixed
+        windows (count, mean, min, max, RMS per channel) at one or more resolutions
+        (see aggregation.Aggregator), e.g. for multi-day runs that only need averages
+        and extremes.
+
+        :param windows: Window lengths, e.g. [1, "1min", "1h"]
+        :param channels: Channels to aggregate (default: all analog inputs)
+        :param on_windows: Optional callable receiving (window_seconds, columns) per batch of completed windows
+        :param sinks: Optional dict mapping a window length to the sink its windows are written to
+        :return: The Aggregator instance
+        """
+        self.aggregator = Aggregator(
+            windows, self.num_analog_inputs, channels=channels, on_windows=on_windows, sinks=sinks
+        )
+        logger.info("Aggregating scans into %s s windows", self.aggregator.windows)
+        return self.aggregator
+
+    def stop_aggregation(self):
+        """
+        Emit the windows still being filled and stop aggregating.
+        """
+        with self._outputs_lock:
+            aggregator, self.aggregator = self.aggregator, None
+        if aggregator is not None:
+            aggregator.flush()
+            logger.info("Stopped aggregation after %s scans", aggregator.scans_written)
 
     def start(self):
-        try:
-            self.handle = ljm.openS("T7", self.connection_type, self.ip_address)
-            self.device_info = ljm.getHandleInfo(self.handle)
-            logging.info(f"Opened LabJack T7: {self.device_info}")
-            
-            for i in range(self.num_analog_inputs):
-                self.set_range(i, self.voltage_range)
-                self.set_resolution_index(i, 0)  # Auto-resolution index
-        except ljm.LJMError as e:
-            logging.error(f"Error opening LabJack T7: {e}")
-            raise Exception(f"Failed to start LabJack: {e}")
+        """
+        Open the device and apply the full channel configuration (range, resolution,
+        negative channel and FlexRMS settings) in one batch. The current register values
+        are read first so that only registers that differ are written.
+        """
+        with self._exclusive_configuration():
+            try:
+                self.handle = self.ljm.openS("T7", self.connection_type, self.ip_address)
+                self.device_info = self.ljm.getHandleInfo(self.handle)
+                if self.instrumentation is not None:
+                    self.instrumentation.labels.setdefault("serial", str(self.device_info[2]))
+                logger.info("Opened LabJack T7: %s", self.device_info)
+
+                self.refresh_register_cache()
+                with self.configuration():
+                    for i in range(self.num_analog_inputs):
+                        self.set_range(i, self.channel_ranges.get(i, self.voltage_range))
+                        self.set_resolution_index(i, self.channel_resolution_indices.get(i, self.resolution_index))
+                    for channel, negative_channel in self.channel_negative_channels.items():
+                        self._stage_write(f"AIN{channel}_NEGATIVE_CH", negative_channel)
+                    for channel, rms_enabled in self.channel_rms_flags.items():
+                        self.set_channel_rms(channel, rms_enabled, *self.channel_rms_settings.get(channel, ()))
+            except ljm.LJMError as e:
+                logger.error("Error opening LabJack T7: %s", e)
+                raise Exception(f"Failed to start LabJack: {e}")
+        if self.supervisor is not None:
+            self.supervisor.activate()
+
+    def _configuration_register_names(self):
+        names = []
+        for channel in range(self.num_analog_inputs):
+            names += [
+                f"AIN{channel}_RANGE", f"AIN{channel}_RESOLUTION_INDEX", f"AIN{channel}_NEGATIVE_CH",
+                f"AIN{channel}_EF_INDEX", f"AIN{channel}_EF_CONFIG_A", f"AIN{channel}_EF_CONFIG_B",
+            ]
+        return names
+
+    def refresh_register_cache(self):
+        """
+        Read every channel configuration register in one eReadAddresses call and use the
+        values as the cached device state. If the read fails the cache is cleared, so the
+        next commit() writes every staged register.
+        """
+        with self._config_lock:
+            names = self._configuration_register_names()
+            try:
+                addresses, data_types = self._register_addresses_for(names)
+                values = self.ljm.eReadAddresses(self.handle, len(names), addresses, data_types)
+            except ljm.LJMError as e:
+                logger.warning("Could not read device configuration, all registers will be written: %s", e)
+                self._register_cache = {}
+                return
+            self._register_cache = dict(zip(names, values))
+
+    def begin(self):
+        """
+        Start a configuration transaction. Setters called until the matching commit()
+        stage their register writes instead of sending them.
+        """
+        with self._config_lock:
+            self._transaction_depth += 1
+
+    def commit(self):
+        """
+        End a configuration transaction and send all staged writes in one eWriteAddresses batch.
+        Registers whose value already matches the cached device state are skipped.
+
+        :return: Number of registers actually written
+        """
+        with self._config_lock:
+            self._transaction_depth = max(0, self._transaction_depth - 1)
+            if self._transaction_depth:
+                return 0
+            try:
+                return self._commit_staged()
+            except ljm.LJMError as e:
+                raise Exception(f"Failed to commit configuration: {e}")
+
+    def discard(self):
+        """
+        Abort the current configuration transaction and drop all staged writes.
+        """
+        with self._config_lock:
+            self._transaction_depth = 0
+            self._staged_writes = []
+
+    @contextlib.contextmanager
+    def configuration(self):
+        """
+        Context manager around begin()/commit(). Staged writes are discarded if the
+        block raises. The block holds the driver's configuration lock, so a reconnect
+        in the background waits for it and then configures the device itself.
+
+            with driver.configuration():
+                driver.set_range(0, "10V")
+                driver.configure_measurement_type(0, "differential", 1)
+        """
+        with self._config_lock:
+            self.begin()
+            try:
+                yield self
+            except BaseException:
+                self.discard()
+                raise
+            self.commit()
+
+    @contextlib.contextmanager
+    def _exclusive_configuration(self):
+        """
+        Hold the configuration lock and set any open transaction aside, so the writes
+        staged in the block are committed by the block itself even when it runs inside
+        a user's transaction (e.g. start() during a reconnect). The transaction is
+        restored afterwards.
+        """
+        with self._config_lock:
+            depth, staged = self._transaction_depth, self._staged_writes
+            self._transaction_depth, self._staged_writes = 0, []
+            try:
+                yield
+            finally:
+                self._transaction_depth, self._staged_writes = depth, staged
+
+    def _expected_value(self, name):
+        """
+        Value a register will have once staged writes are committed, or None if unknown.
+        """
+        for staged_name, value in reversed(self._staged_writes):
+            if staged_name == name:
+                return value
+        return self._register_cache.get(name)
+
+    def _stage_write(self, name, value):
+        self._staged_writes.append((name, value))
+
+    def _apply(self, error_message):
+        """
+        Commit staged writes immediately unless a transaction is open.
+        """
+        with self._config_lock:
+            if self._transaction_depth:
+                return
+            try:
+                self._commit_staged()
+            except ljm.LJMError as e:
+                raise Exception(f"{error_message}: {e}")
+
+    def _commit_staged(self):
+        state = dict(self._register_cache)
+        names = []
+        values = []
+        for name, value in self._staged_writes:
+            current = state.get(name)
+            if current is not None and math.isclose(current, value, rel_tol=1e-6, abs_tol=1e-9):
+                continue
+            names.append(name)
+            values.append(value)
+            state[name] = value
+            if name.endswith("_EF_INDEX"):
+                # Writing EF_INDEX resets the feature's config registers on the device
+                prefix = name[:-len("INDEX")] + "CONFIG_"
+                for key in [key for key in state if key.startswith(prefix)]:
+                    del state[key]
+        self._staged_writes = []
+
+        if names:
+            addresses, data_types = self._register_addresses_for(names)
+            self.ljm.eWriteAddresses(self.handle, len(names), addresses, data_types, values)
+            logger.info("Committed %s configuration registers in one batch", len(names))
+        self._register_cache = state
+        return len(names)
 
     def stop(self):
+        self._stream_args = None
+        self._stream_stop_event.set()
         try:
-            ljm.eStreamStop(self.handle)
-            logging.info("Stream stopped.")
+            self.ljm.eStreamStop(self.handle)
+            logger.info("Stream stopped.")
         except ljm.LJMError as e:
-            logging.warning(f"Stream not running or error stopping: {e}")
+            logger.warning("Stream not running or error stopping: %s", e)
+        if self._stream_thread is not None:
+            self._stream_thread.join()
+            self._stream_thread = None
+        with self._stream_lock:
+            self._stream_data_ready.notify_all()
+        if self._host_statistics is not None:
+            self._host_statistics = None
+            self._invalidate_read_plan()
 
     def close(self):
-        if self.handle:
-            ljm.close(self.handle)
-            logging.info("Closed LabJack connection.")
+        if self.supervisor is not None:
+            self.supervisor.shutdown()
+        self._close_handle()
+
+    def _close_handle(self):
+        with self._config_lock:
+            if self.handle:
+                self.ljm.close(self.handle)
+                self.handle = None
+                self._register_cache = {}
+                logger.info("Closed LabJack connection.")
 
     def set_range(self, channel, voltage_range):
-        if voltage_range not in self.voltage_ranges:
-            raise ValueError(f"Invalid voltage range: {voltage_range}")
-        try:
-            ljm.eWriteName(self.handle, f"AIN{channel}_RANGE", self.voltage_ranges[voltage_range])
-            logging.info(f"Set AIN{channel} range to {voltage_range}")
-        except ljm.LJMError as e:
-            raise Exception(f"Failed to set voltage range for channel {channel}: {e}")
+        with self._config_lock:
+            if voltage_range not in self.voltage_ranges:
+                raise ValueError(f"Invalid voltage range: {voltage_range}")
+            self._stage_write(f"AIN{channel}_RANGE", self.voltage_ranges[voltage_range])
+            self._apply(f"Failed to set voltage range for channel {channel}")
+            logger.info("Set AIN%s range to %s", channel, voltage_range)
+            self.channel_ranges[channel] = voltage_range
 
     def set_resolution_index(self, channel, resolution_index):
-        try:
-            ljm.eWriteName(self.handle, f"AIN{channel}_RESOLUTION_INDEX", resolution_index)
-            logging.info(f"Set AIN{channel} resolution index to {resolution_index}")
-        except ljm.LJMError as e:
-            raise Exception(f"Failed to set resolution index for channel {channel}: {e}")
+        with self._config_lock:
+            self._stage_write(f"AIN{channel}_RESOLUTION_INDEX", resolution_index)
+            self._apply(f"Failed to set resolution index for channel {channel}")
+            logger.info("Set AIN%s resolution index to %s", channel, resolution_index)
+            self.channel_resolution_indices[channel] = resolution_index
 
     def configure_measurement_type(self, channel, measurement_type="single-ended", differential_negative_channel=None):
-        if measurement_type == "single-ended":
-            negative_channel_val = 199  # GND for single-ended
-        elif measurement_type == "differential":
-            if differential_negative_channel is None:
-                raise ValueError("You must specify a valid negative channel for differential measurements.")
-            negative_channel_val = differential_negative_channel
-        else:
-            raise ValueError("Invalid measurement type. Use 'single-ended' or 'differential'.")
+        with self._config_lock:
+            if measurement_type == "single-ended":
+                negative_channel_val = 199  # GND for single-ended
+            elif measurement_type == "differential":
+                if differential_negative_channel is None:
+                    raise ValueError("You must specify a valid negative channel for differential measurements.")
+                negative_channel_val = differential_negative_channel
+            else:
+                raise ValueError("Invalid measurement type. Use 'single-ended' or 'differential'.")
 
-        try:
-            ljm.eWriteName(self.handle, f"AIN{channel}_NEGATIVE_CH", negative_channel_val)
-            logging.info(f"Configured AIN{channel} for {measurement_type} measurement with negative channel {negative_channel_val}")
+            self._stage_write(f"AIN{channel}_NEGATIVE_CH", negative_channel_val)
+            self._apply(f"Failed to configure measurement type for channel {channel}")
+            logger.info(
+                "Configured AIN%s for %s measurement with negative channel %s",
+                channel, measurement_type, negative_channel_val,
+            )
             self.channel_types[channel] = measurement_type  # Store the channel type
-        except ljm.LJMError as e:
-            raise Exception(f"Failed to configure measurement type for channel {channel}: {e}")
+            self.channel_negative_channels[channel] = negative_channel_val
 
     def set_channel_rms(self, channel, rms_enabled, num_scans=200, scan_time_microseconds=10000):
         """
@@ -95,74 +457,531 @@ class LabJackT7Driver:
         :param num_scans: Number of scans to use for FlexRMS (default 200)
         :param scan_time_microseconds: Total time in microseconds for the FlexRMS scan (default 10,000 µs = 10 ms)
         """
-        if rms_enabled:
+        with self._config_lock:
+            ef_index = f"AIN{channel}_EF_INDEX"
+            if rms_enabled:
+                current_index = self._expected_value(ef_index)
+                if current_index != 10:
+                    if current_index != 0:
+                        # Reset any existing extended feature on this channel before enabling FlexRMS
+                        self._stage_write(ef_index, 0)
+                    # Enable FlexRMS mode for this channel (EF_INDEX 10)
+                    self._stage_write(ef_index, 10)
+                self._stage_write(f"AIN{channel}_EF_CONFIG_A", num_scans)  # Set number of scans
+                self._stage_write(f"AIN{channel}_EF_CONFIG_B", scan_time_microseconds)  # Set scan time
+                self._apply(f"Failed to enable FlexRMS for AIN{channel}")
+                logger.info(
+                    "Enabled FlexRMS for AIN%s with %s scans over %s µs", channel, num_scans, scan_time_microseconds
+                )
+                self.channel_rms_settings[channel] = (num_scans, scan_time_microseconds)
+            else:
+                # Disable FlexRMS mode for this channel
+                self._stage_write(ef_index, 0)  # Disable extended feature
+                self._apply(f"Failed to disable FlexRMS for AIN{channel}")
+                logger.info("Disabled FlexRMS for AIN%s", channel)
+
+            self.channel_rms_flags[channel] = rms_enabled
+            self._invalidate_read_plan()
+
+    def _register_names(self):
+        names = [
+            "STREAM_TRIGGER_INDEX", "STREAM_CLOCK_SOURCE", "STREAM_SETTLING_US", "STREAM_RESOLUTION_INDEX",
+        ]
+        for channel in range(self.num_analog_inputs):
+            names += [f"AIN{channel}", f"AIN{channel}_EF_READ_A"]
+        return names + self._configuration_register_names()
+
+    def _register_address(self, name):
+        """
+        Look up the Modbus address and data type of a register name. All names the driver
+        uses are resolved in one namesToAddresses call the first time any is needed.
+
+        :return: Tuple of (address, data_type)
+        """
+        if not self._register_addresses:
+            names = self._register_names()
+            addresses, data_types = self.ljm.namesToAddresses(len(names), names)
+            self._register_addresses = {
+                name: (address, data_type) for name, address, data_type in zip(names, addresses, data_types)
+            }
+        if name not in self._register_addresses:
+            self._register_addresses[name] = tuple(self.ljm.nameToAddress(name))
+        return self._register_addresses[name]
+
+    def _register_addresses_for(self, names):
+        addresses = []
+        data_types = []
+        for name in names:
+            address, data_type = self._register_address(name)
+            addresses.append(address)
+            data_types.append(data_type)
+        return addresses, data_types
+
+    def _get_read_plan(self):
+        """
+        Return the cached address list read on every scan, one frame per channel.
+        FlexRMS channels read AIN#_EF_READ_A, all others read AIN# directly; channels whose
+        statistics are computed on the host are left out. The plan is rebuilt only after
+        the RMS flags, scaling factors or host statistics channels change.
+        """
+        if self._read_plan is None:
+            host_channels = self._host_statistics.channels if self._host_statistics is not None else ()
+            channels = [channel for channel in range(self.num_analog_inputs) if channel not in host_channels]
+            names = [
+                f"AIN{channel}_EF_READ_A" if self.channel_rms_flags.get(channel, False) else f"AIN{channel}"
+                for channel in channels
+            ]
+            addresses, data_types = self._register_addresses_for(names)
+            self._read_plan = _ReadPlan(
+                channels=channels,
+                keys=[f"AIN{channel}" for channel in channels],
+                addresses=addresses,
+                data_types=data_types,
+                rms_mask=np.array([name.endswith("_EF_READ_A") for name in names]),
+                scaling_factors=np.array(
+                    [self.channel_scaling_factors.get(channel, 1) for channel in channels], dtype=np.float64
+                ),
+            )
+        return self._read_plan
+
+    def _invalidate_read_plan(self):
+        self._read_plan = None
+
+    def _read_frames(self, plan):
+        """
+        Read all frames of the plan with a single eReadAddresses call.
+
+        If a FlexRMS channel cannot find a period, the offending channel is reported as 0
+        and the batch is re-issued without it, so the remaining channels still come back
+        from one round trip.
+
+        :return: NumPy array of raw (unscaled) values, one per frame
+        """
+        values = np.zeros(len(plan.channels), dtype=np.float64)
+        pending = list(range(len(plan.channels)))
+        addresses = plan.addresses
+        data_types = plan.data_types
+        started = time.perf_counter()
+        while pending:
             try:
-                # Reset any existing extended feature on this channel before enabling FlexRMS
-                ljm.eWriteName(self.handle, f"AIN{channel}_EF_INDEX", 0)
-                logging.info(f"Reset existing extended feature for AIN{channel}")
-                
-                # Enable FlexRMS mode for this channel (EF_INDEX 10)
-                ljm.eWriteName(self.handle, f"AIN{channel}_EF_INDEX", 10)  # Set to FlexRMS (EF_INDEX 10)
-                ljm.eWriteName(self.handle, f"AIN{channel}_EF_CONFIG_A", num_scans)  # Set number of scans
-                ljm.eWriteName(self.handle, f"AIN{channel}_EF_CONFIG_B", scan_time_microseconds)  # Set scan time
-                logging.info(f"Enabled FlexRMS for AIN{channel} with {num_scans} scans over {scan_time_microseconds} µs")
+                read = self.ljm.eReadAddresses(self.handle, len(pending), addresses, data_types)
             except ljm.LJMError as e:
-                raise Exception(f"Failed to enable FlexRMS for AIN{channel}: {e}")
-        else:
+                if "AIN_EF_COULD_NOT_FIND_PERIOD" not in str(e):
+                    raise
+                failed = self._frame_for_error(plan, pending, e)
+                if failed is None:
+                    # Could not tell which channel failed; fall back to one read per frame
+                    return self._read_frames_individually(plan, pending, values)
+                frame = pending.pop(failed)
+                if self.instrumentation is not None:
+                    self.instrumentation.record_channels((plan.channels[frame],), time.perf_counter() - started)
+                logger.warning("Could not find valid FlexRMS period for AIN%s. Returning 0.", plan.channels[frame])
+                addresses = [plan.addresses[i] for i in pending]
+                data_types = [plan.data_types[i] for i in pending]
+                continue
+
+            values[pending] = read
+            if self.instrumentation is not None:
+                channels = plan.channels if len(pending) == len(plan.channels) else [plan.channels[i] for i in pending]
+                self.instrumentation.record_channels(channels, time.perf_counter() - started)
+            break
+
+        values[plan.rms_mask] = np.abs(values[plan.rms_mask])  # Ensure FlexRMS values are non-negative
+        return values
+
+    def _frame_for_error(self, plan, pending, error):
+        """
+        Find the position in pending of the FlexRMS frame responsible for an LJMError,
+        using the Modbus address LJM reports.
+        """
+        if error.errorAddress is None:
+            return None
+        for index, frame in enumerate(pending):
+            if plan.rms_mask[frame] and plan.addresses[frame] == error.errorAddress:
+                return index
+        return None
+
+    def _read_frames_individually(self, plan, pending, values):
+        for frame in pending:
+            started = time.perf_counter()
             try:
-                # Disable FlexRMS mode for this channel
-                ljm.eWriteName(self.handle, f"AIN{channel}_EF_INDEX", 0)  # Disable extended feature
-                logging.info(f"Disabled FlexRMS for AIN{channel}")
+                values[frame] = self.ljm.eReadAddress(self.handle, plan.addresses[frame], plan.data_types[frame])
             except ljm.LJMError as e:
-                raise Exception(f"Failed to disable FlexRMS for AIN{channel}: {e}")
-        
-        self.channel_rms_flags[channel] = rms_enabled
-
- def read_samples(self):
+                if "AIN_EF_COULD_NOT_FIND_PERIOD" in str(e):
+                    logger.warning("Could not find valid FlexRMS period for AIN%s. Returning 0.", plan.channels[frame])
+                    values[frame] = 0
+                    continue
+                raise
+            finally:
+                if self.instrumentation is not None:
+                    self.instrumentation.record_channels((plan.channels[frame],), time.perf_counter() - started)
+        values[plan.rms_mask] = np.abs(values[plan.rms_mask])
+        return values
 
-    results = {}
+    def read_samples(self):
+        """
+        Read every analog input in a single round trip and apply the per-channel scaling factors.
 
-    for channel in range(self.num_analog_inputs):
-        try:
-            if self.channel_rms_flags.get(channel, False):
-                # Try to read FlexRMS value from the AIN#_EF_READ_A register
-                try:
-                    value = ljm.eReadName(self.handle, f"AIN{channel}_EF_READ_A")
-                    logging.info(f"Read FlexRMS value for AIN{channel}: {value}")
-                    value = abs(value)  # Ensure the FlexRMS value is non-negative
-                except ljm.LJMError as e:
-                    if "AIN_EF_COULD_NOT_FIND_PERIOD" in str(e):
-                        logging.warning(f"Could not find valid FlexRMS period for AIN{channel}. Returning 0.")
-                        value = 0  # Return 0 or a default value
-                    else:
-                        raise e  # Re-raise other errors
-            else:
-                # Read normal voltage value
-                value = ljm.eReadName(self.handle, f"AIN{channel}")
-                logging.info(f"Read value for AIN{channel}: {value}")
+        If the read fails, or the supervisor is still reconnecting, the scan is returned
+        immediately with every channel set to NaN so the gap is explicit in the output.
+        Connection errors (see supervisor.is_connection_error) start a background
+        reconnect; other errors only cost the scan. Without a supervisor the device is
+        restarted synchronously and an empty dict is returned.
 
-            # Apply the scaling factor if it exists
-            scaling_factor = self.channel_scaling_factors.get(channel, 1)
-            value *= scaling_factor
+        :return: Dict mapping "AIN#" to the scaled value
+        :raises EndOfRecording: When replaying a recording through ReplayLJM and it has ended
+        """
+        if self.supervisor is not None and not self.supervisor.connected:
+            return self._missing_scan()
 
-            results[f"AIN{channel}"] = value
+        scan_started = time.perf_counter()
+        plan = self._get_read_plan()
 
+        try:
+            scaled = self._read_frames(plan) if plan.channels else np.empty(0, dtype=np.float64)
+        except EndOfRecording:
+            raise
         except ljm.LJMError as e:
-            logging.error(f"Error encountered while reading from AIN{channel}: {e}")
+            logger.error("Error encountered while reading analog inputs: %s", e)
+            if self.supervisor is not None:
+                if is_connection_error(e):
+                    self.supervisor.connection_lost(e)
+                return self._missing_scan()
             # Restart the device to recover from the error
             self.restart_device()
-            break  # Exit the loop to avoid further issues in this read cycle
-
-    return results
-
-def restart_device(self):
-    """
-    Attempt to restart the LabJack device connection.
-    """
-    try:
-        logging.info("Restarting LabJack connection...")
-        self.close()  # Close the existing connection
-        self.start()  # Re-open the connection
-        logging.info("LabJack connection restarted successfully.")
-    except ljm.LJMError as e:
-        logging.error(f"Failed to restart LabJack connection: {e}")
+            return {}
+
+        timestamp = time.time()
+        scaled *= plan.scaling_factors
+        channels = plan.channels
+
+        if self._host_statistics is not None:
+            # Host-side RMS channels: period-aligned RMS over the rolling window, falling
+            # back to the plain window RMS when no full period was found
+            statistics = self.read_statistics()
+            host_values = [
+                statistics[f"AIN{channel}"]["period_rms"] if not math.isnan(statistics[f"AIN{channel}"]["period_rms"])
+                else statistics[f"AIN{channel}"]["rms"]
+                for channel in self._host_statistics.channels
+            ]
+            channels = plan.channels + self._host_statistics.channels
+            scaled = np.concatenate((scaled, host_values))
+            order = np.argsort(channels, kind="stable")
+            channels = [channels[index] for index in order]
+            scaled = scaled[order]
+
+        self._write_outputs((timestamp,), scaled[:, np.newaxis], rows=channels)
+
+        if self.instrumentation is not None:
+            self.instrumentation.record_scan(time.perf_counter() - scan_started)
+        if self._sample_trace_every is not None:
+            self._trace_scan(channels, scaled)
+        return {f"AIN{channel}": value for channel, value in zip(channels, scaled.tolist())}
+
+    def _write_outputs(self, timestamps, values, scaling_factors=None, rows=None):
+        """
+        Write a block of scans to the enabled buffer, recorder, publisher and aggregator.
+
+        :param values: Array of shape (len(rows), n), unscaled if scaling_factors is given
+        """
+        with self._outputs_lock:
+            if self.buffer is not None:
+                self.buffer.write(timestamps, values, scaling_factors, rows=rows)
+            if self.recorder is not None:
+                scaled = values
+                if scaling_factors is not None:
+                    scaled = values * np.asarray(scaling_factors, dtype=np.float64)[:, np.newaxis]
+                self.recorder.append_block(timestamps, scaled, rows=rows)
+            if self.publisher is not None:
+                self.publisher.write(timestamps, values, scaling_factors, rows=rows)
+            if self.aggregator is not None:
+                self.aggregator.write(timestamps, values, scaling_factors, rows=rows)
+
+    def enable_sample_trace(self, every=1, min_interval=0.0):
+        """
+        Log the values of read_samples() scans at DEBUG level on this module's logger
+        ("LabjackClient.LabJackT7Driver"), which must itself be enabled for DEBUG.
+
+        By default nothing is logged per scan; tracing is sampled to every `every`-th
+        scan and rate-limited to one line per min_interval seconds.
+
+        :param every: Trace one scan out of this many
+        :param min_interval: Minimum seconds between traced scans
+        """
+        if every < 1:
+            raise ValueError(f"Invalid trace sampling: {every}. Must be at least 1.")
+        self._sample_trace_every = every
+        self._sample_trace_interval = min_interval
+        self._sample_trace_scans = 0
+        self._sample_trace_last = None
+
+    def disable_sample_trace(self):
+        self._sample_trace_every = None
+
+    def _trace_scan(self, channels, values):
+        self._sample_trace_scans += 1
+        if self._sample_trace_scans % self._sample_trace_every or not logger.isEnabledFor(logging.DEBUG):
+            return
+        now = time.monotonic()
+        if self._sample_trace_last is not None and now - self._sample_trace_last < self._sample_trace_interval:
+            return
+        self._sample_trace_last = now
+        logger.debug(
+            "Scan %s: %s", self._sample_trace_scans,
+            ", ".join(
+                f"AIN{channel}{' (RMS)' if self.channel_rms_flags.get(channel) else ''}={value}"
+                for channel, value in zip(channels, values.tolist())
+            ),
+        )
+
+    def _missing_scan(self):
+        """
+        Return (and buffer/record) a scan with every channel set to NaN, marking a scan
+        that could not be acquired.
+        """
+        timestamp = time.time()
+        channels = list(range(self.num_analog_inputs))
+        values = np.full(len(channels), np.nan)
+        self._write_outputs((timestamp,), values[:, np.newaxis])
+        self.supervisor.record_missing_scan()
+        return {f"AIN{channel}": float("nan") for channel in channels}
+
+    def start_host_statistics(self, scan_rate, window_seconds=0.1, channels=None, scans_per_read=None):
+        """
+        Stream raw samples for the RMS-flagged channels and compute RMS, mean, min/max, peak
+        and period-aligned RMS on the host instead of with FlexRMS on the device.
+
+        While enabled, read_samples() reports the host-side RMS for these channels and reads
+        the remaining channels as usual. The stream is consumed internally, so read_stream()
+        should not be called at the same time.
+
+        :param scan_rate: Stream scan rate in Hz; should cover several periods of the signal per window
+        :param window_seconds: Length of the rolling window statistics are computed over
+        :param channels: Channels to stream (default: all channels with RMS enabled)
+        :param scans_per_read: Scans per eStreamRead (default scan_rate / 10)
+        :return: Actual scan rate reported by the device
+        """
+        if channels is None:
+            channels = sorted(channel for channel, enabled in self.channel_rms_flags.items() if enabled)
+        if not channels:
+            raise ValueError("No channels selected for host-side statistics.")
+
+        scan_rate = self.start_stream(scan_rate, scans_per_read=scans_per_read, channels=channels)
+        self._host_statistics = WindowStatistics(self.stream_channels, scan_rate, window_seconds)
+        self._invalidate_read_plan()
+        logger.info("Computing statistics on the host for %s over %s s windows", self.stream_channels, window_seconds)
+        return scan_rate
+
+    def read_statistics(self, timeout=0):
+        """
+        Fold newly streamed samples into the rolling window and return its statistics.
+
+        :param timeout: Seconds to wait for new stream data (default: do not wait)
+        :return: Dict mapping "AIN#" to {"mean", "rms", "min", "max", "peak", "period_rms", "periods", "count"}
+        """
+        if self._host_statistics is None:
+            raise RuntimeError("Host statistics are not running. Call start_host_statistics() first.")
+        self._host_statistics.update(self.read_stream(timeout=timeout))
+        return self._host_statistics.compute()
+
+    def _stream_scan_channels(self):
+        """
+        Channels to include in a stream scan list: every configured channel (or all inputs
+        if none were configured), minus the odd channels used as differential negatives.
+        """
+        channels = sorted(self.channel_types) or list(range(self.num_analog_inputs))
+        negatives = {
+            negative for channel, negative in self.channel_negative_channels.items()
+            if self.channel_types.get(channel) == "differential"
+        }
+        return [channel for channel in channels if channel not in negatives]
+
+    def start_stream(self, scan_rate, scans_per_read=None, channels=None, max_buffered_blocks=1000):
+        """
+        Start a hardware-paced stream of the configured analog inputs and a background
+        thread that drains eStreamRead blocks into a buffer consumed by read_stream().
+
+        The range and negative channel of each streamed channel are written in one batch
+        before the stream starts, since stream mode does not configure them itself.
+
+        :param scan_rate: Desired scans per second (the device may adjust it)
+        :param scans_per_read: Scans returned per eStreamRead call (default scan_rate / 10)
+        :param channels: Channel numbers to stream (default: all configured channels)
+        :param max_buffered_blocks: Blocks kept before the oldest are dropped
+        :return: Actual scan rate reported by the device
+        """
+        if self._stream_thread is not None:
+            raise RuntimeError("Stream is already running. Call stop() first.")
+
+        self.stream_channels = list(channels) if channels is not None else self._stream_scan_channels()
+        if not self.stream_channels:
+            raise ValueError("No channels configured for streaming.")
+        if scans_per_read is None:
+            scans_per_read = max(1, int(scan_rate / 10))
+
+        with self._exclusive_configuration():
+            for name, value in (
+                ("STREAM_TRIGGER_INDEX", 0), ("STREAM_CLOCK_SOURCE", 0),
+                ("STREAM_SETTLING_US", 0), ("STREAM_RESOLUTION_INDEX", self.resolution_index),
+            ):
+                self._stage_write(name, value)
+            for channel in self.stream_channels:
+                self._stage_write(
+                    f"AIN{channel}_RANGE", self.voltage_ranges[self.channel_ranges.get(channel, self.voltage_range)]
+                )
+                self._stage_write(f"AIN{channel}_NEGATIVE_CH", self.channel_negative_channels.get(channel, 199))
+
+            try:
+                self._commit_staged()
+                scan_list = self._register_addresses_for([f"AIN{channel}" for channel in self.stream_channels])[0]
+                self.stream_scan_rate = self.ljm.eStreamStart(
+                    self.handle, scans_per_read, len(scan_list), scan_list, scan_rate
+                )
+                self.stream_start_time = time.time()
+            except ljm.LJMError as e:
+                raise Exception(f"Failed to start stream: {e}")
+
+        logger.info("Started stream of %s channels at %s scans/s", len(self.stream_channels), self.stream_scan_rate)
+        self._stream_args = (scan_rate, scans_per_read, list(self.stream_channels), max_buffered_blocks)
+
+        self._stream_blocks = collections.deque(maxlen=max_buffered_blocks)
+        self._stream_status = {
+            "scans_read": 0,
+            "skipped_samples": 0,
+            "device_scan_backlog": 0,
+            "ljm_scan_backlog": 0,
+            "dropped_blocks": 0,
+            "error": None,
+        }
+        self._stream_stop_event.clear()
+        self._stream_thread = threading.Thread(target=self._stream_reader, name="LabJackStreamReader", daemon=True)
+        self._stream_thread.start()
+        return self.stream_scan_rate
+
+    def _stream_reader(self):
+        """
+        Background loop that drains eStreamRead into the stream buffer until stop() is called.
+        """
+        num_channels = len(self.stream_channels)
+        scaling_factors = [self.channel_scaling_factors.get(channel, 1) for channel in self.stream_channels]
+        scan_index = 0  # Scans read since eStreamStart
+        while not self._stream_stop_event.is_set():
+            try:
+                data, device_backlog, ljm_backlog = self.ljm.eStreamRead(self.handle)
+            except ljm.LJMError as e:
+                if not self._stream_stop_event.is_set():
+                    logger.error("Stream read failed: %s", e)
+                    with self._stream_lock:
+                        self._stream_status["error"] = str(e)
+                        self._stream_data_ready.notify_all()
+                    if self.supervisor is not None and is_connection_error(e):
+                        self.supervisor.connection_lost(e, resume_stream=True)
+                break
+
+            block = np.asarray(data, dtype=np.float64).reshape(-1, num_channels).T
+            skipped_mask = block == ljm.constants.DUMMY_VALUE
+            skipped = int(np.count_nonzero(skipped_mask))
+            block[skipped_mask] = np.nan
+            num_scans = block.shape[1]
+
+            if any(output is not None for output in (self.buffer, self.recorder, self.publisher, self.aggregator)):
+                # Stamp scans from the hardware scan clock rather than the arrival time of
+                # the block, which jitters and lags by the LJM backlog
+                timestamps = self.stream_start_time + (scan_index + np.arange(num_scans)) / self.stream_scan_rate
+                self._write_outputs(timestamps, block, scaling_factors, rows=self.stream_channels)
+            scan_index += num_scans
+
+            with self._stream_lock:
+                if len(self._stream_blocks) == self._stream_blocks.maxlen:
+                    self._stream_status["dropped_blocks"] += 1
+                self._stream_blocks.append(block)
+                self._stream_status["scans_read"] += block.shape[1]
+                self._stream_status["skipped_samples"] += skipped
+                self._stream_status["device_scan_backlog"] = device_backlog
+                self._stream_status["ljm_scan_backlog"] = ljm_backlog
+                self._stream_data_ready.notify_all()
+
+            if skipped:
+                logger.warning(
+                    "Stream skipped %s samples (device backlog %s, LJM backlog %s)", skipped, device_backlog, ljm_backlog
+                )
+
+    def read_stream(self, timeout=None):
+        """
+        Consume all buffered stream data, waiting up to timeout seconds for at least one block.
+        Skipped samples (LJM dummy value -9999) are returned as NaN.
+
+        :return: Dict mapping "AIN#" to a NumPy array of scaled values, oldest first
+        """
+        with self._stream_lock:
+            if not self._stream_blocks and self._stream_thread is not None:
+                self._stream_data_ready.wait(timeout)
+            blocks = list(self._stream_blocks or ())
+            if self._stream_blocks is not None:
+                self._stream_blocks.clear()
+
+        num_channels = len(self.stream_channels)
+        if blocks:
+            data = np.concatenate(blocks, axis=1)
+        else:
+            data = np.empty((num_channels, 0), dtype=np.float64)
+        scaling_factors = [self.channel_scaling_factors.get(channel, 1) for channel in self.stream_channels]
+        data *= np.asarray(scaling_factors, dtype=np.float64)[:, np.newaxis]
+        return {f"AIN{channel}": data[index] for index, channel in enumerate(self.stream_channels)}
+
+    def get_stream_status(self):
+        """
+        Return stream health counters: scans read, skipped samples, device and LJM
+        scan backlog from the last eStreamRead, dropped buffer blocks, and the last error.
+        """
+        with self._stream_lock:
+            status = dict(self._stream_status)
+        status["running"] = self._stream_thread is not None and self._stream_thread.is_alive()
+        status["scan_rate"] = self.stream_scan_rate
+        return status
+
+    def get_connection_metrics(self):
+        """
+        Return reconnect counters and downtime from the connection supervisor, plus the
+        recorded gaps as (start, end) timestamps. Empty if auto_reconnect is disabled.
+        """
+        if self.supervisor is None:
+            return {}
+        metrics = self.supervisor.get_metrics()
+        metrics["gap_intervals"] = list(self.supervisor.gaps)
+        return metrics
+
+    def restart_device(self):
+        """
+        Attempt to restart the LabJack device connection.
+        """
+        try:
+            logger.info("Restarting LabJack connection...")
+            self._reopen()
+            logger.info("LabJack connection restarted successfully.")
+        except Exception as e:
+            logger.error("Failed to restart LabJack connection: %s", e)
+
+    def _reopen(self):
+        """
+        Close the handle (ignoring errors from a dead connection) and start again, which
+        reapplies the cached channel configuration in one batch.
+        """
+        with self._config_lock:
+            try:
+                self._close_handle()
+            except ljm.LJMError as e:
+                logger.warning("Error closing stale LabJack handle: %s", e)
+                self.handle = None
+            self.start()
+
+    def _resume_stream(self):
+        """
+        Restart the stream with the arguments of the last start_stream() call after a reconnect.
+        """
+        if self._stream_args is None:
+            return
+        if self._stream_thread is not None:
+            self._stream_thread.join()
+            self._stream_thread = None
+        self.start_stream(*self._stream_args)
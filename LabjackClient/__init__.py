@@ -1 +1,12 @@
 from .LabJackT7Driver import LabJackT7Driver
+from .ring_buffer import ScanRingBuffer
+from .manager import LabJackManager
+from .async_driver import AsyncLabJackT7Driver
+from .scheduler import FixedRateScheduler
+from .simulator import SimulatedLJM
+from .sinks import CSVSink, ParquetSink, build_sinks
+from .recording import EndOfRecording, RecordingReader, ReplayLJM, ScanRecorder
+from .supervisor import ConnectionSupervisor
+from .instrumentation import Instrumentation
+from .shared_ring import SharedScanPublisher, SharedScanSubscriber
+from .aggregation import Aggregator
@@ -0,0 +1,169 @@
+import threading
+
+import numpy as np
+
+from .scheduler import parse_frequency
+
+STATISTICS = ("count", "mean", "min", "max", "rms")
+
+
+def parse_window(window):
+    """
+    Convert a window length such as 1, 0.5, "10s", "5min" or "1h" to seconds.
+    """
+    if isinstance(window, (int, float)):
+        return float(window)
+    text = str(window).strip().lower().replace(" ", "")
+    for suffix, multiplier in (("ms", 1e-3), ("min", 60.0), ("s", 1.0), ("m", 60.0), ("h", 3600.0)):
+        if text.endswith(suffix):
+            return float(text[:-len(suffix)]) * multiplier
+    if text.endswith("hz"):
+        return 1.0 / parse_frequency(text)
+    return float(text)
+
+
+class _Partial:
+    """
+    Running sums of the window currently being filled at one resolution.
+    """
+
+    def __init__(self, num_channels):
+        self.index = None  # Window number (start time // window length), None before the first scan
+        self.count = np.zeros(num_channels, dtype=np.int64)
+        self.sum = np.zeros(num_channels, dtype=np.float64)
+        self.sum_squares = np.zeros(num_channels, dtype=np.float64)
+        self.min = np.full(num_channels, np.nan)
+        self.max = np.full(num_channels, np.nan)
+
+
+class Aggregator:
+    """
+    Reduce scans into fixed, wall-clock aligned windows (count, mean, min, max, RMS per
+    channel) at one or more resolutions at once, so stored data scales with the number
+    of windows rather than the raw sample rate.
+
+    Scans are written with the same signature as ScanRingBuffer.write(), so the driver
+    can feed it from read_samples() and the stream reader alike. Each block is reduced
+    with one np.*.reduceat pass per resolution. Windows start at multiples of their
+    length since the epoch, so windows of different resolutions line up. A window is
+    emitted once a scan past its end arrives (or on flush()); NaN samples are left out
+    of the statistics and windows without any scans are not emitted.
+
+    Completed windows are delivered as columnar batches with window_start, window_end
+    and "AIN#_<statistic>" columns: passed to on_windows(window_seconds, columns) and
+    to the sink configured for that resolution (see sinks.BackgroundSink.write_batch).
+
+    :param windows: Window lengths, e.g. [1, "1min", "1h"]
+    :param num_channels: Number of channel rows in the written scans
+    :param channels: Channel rows to aggregate (default: all)
+    :param on_windows: Optional callable receiving (window_seconds, columns) for each batch of completed windows
+    :param sinks: Optional dict mapping a window length to the sink its windows are written to
+    """
+
+    def __init__(self, windows, num_channels, channels=None, on_windows=None, sinks=None):
+        self.windows = sorted({parse_window(window) for window in windows})
+        if not self.windows or min(self.windows) <= 0:
+            raise ValueError("Aggregation windows must be positive.")
+        self.num_channels = int(num_channels)
+        self.channels = list(range(self.num_channels)) if channels is None else list(channels)
+        self.on_windows = on_windows
+        self.sinks = {parse_window(window): sink for window, sink in (sinks or {}).items()}
+        self.windows_emitted = {window: 0 for window in self.windows}
+        self.scans_written = 0
+        self._partials = {window: _Partial(len(self.channels)) for window in self.windows}
+        self._lock = threading.Lock()
+
+    def write(self, timestamps, values, scaling_factors=None, rows=None):
+        """
+        Add a block of scans. Timestamps must be non-decreasing, also from one block to
+        the next, as they are for read_samples() and the stream reader.
+
+        :param timestamps: Sequence of n timestamps (seconds since the epoch)
+        :param values: Array-like of shape (len(rows), n)
+        :param scaling_factors: Optional per-row scaling factors
+        :param rows: Channel rows the values belong to (default: all rows); other rows count as missing
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+        if timestamps.shape[0] == 0:
+            return
+        if scaling_factors is not None:
+            values = values * np.asarray(scaling_factors, dtype=np.float64)[:, np.newaxis]
+        if rows is not None:
+            full = np.full((self.num_channels, values.shape[1]), np.nan)
+            full[rows] = values
+            values = full
+        values = values[self.channels]
+
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        squares = filled * filled
+        with self._lock:
+            self.scans_written += timestamps.shape[0]
+            for window in self.windows:
+                self._reduce(window, timestamps, values, valid, filled, squares)
+
+    def _reduce(self, window, timestamps, values, valid, filled, squares):
+        partial = self._partials[window]
+        index = np.floor_divide(timestamps, window).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, index[1:] != index[:-1]])
+        count = np.add.reduceat(valid, starts, axis=1, dtype=np.int64)
+        total = np.add.reduceat(filled, starts, axis=1)
+        sum_squares = np.add.reduceat(squares, starts, axis=1)
+        with np.errstate(invalid="ignore"):
+            minimum = np.fmin.reduceat(values, starts, axis=1)
+            maximum = np.fmax.reduceat(values, starts, axis=1)
+        indices = index[starts]
+
+        if partial.index is not None and partial.index == indices[0]:
+            # The block continues the window still being filled
+            count[:, 0] += partial.count
+            total[:, 0] += partial.sum
+            sum_squares[:, 0] += partial.sum_squares
+            minimum[:, 0] = np.fmin(minimum[:, 0], partial.min)
+            maximum[:, 0] = np.fmax(maximum[:, 0], partial.max)
+        elif partial.index is not None:
+            self._emit(window, np.array([partial.index]), partial.count[:, np.newaxis], partial.sum[:, np.newaxis],
+                       partial.sum_squares[:, np.newaxis], partial.min[:, np.newaxis], partial.max[:, np.newaxis])
+
+        # Every window but the last is complete; the last stays open for the next block
+        if len(indices) > 1:
+            self._emit(window, indices[:-1], count[:, :-1], total[:, :-1], sum_squares[:, :-1],
+                       minimum[:, :-1], maximum[:, :-1])
+        partial.index = int(indices[-1])
+        partial.count = count[:, -1].copy()
+        partial.sum = total[:, -1].copy()
+        partial.sum_squares = sum_squares[:, -1].copy()
+        partial.min = minimum[:, -1].copy()
+        partial.max = maximum[:, -1].copy()
+
+    def _emit(self, window, indices, count, total, sum_squares, minimum, maximum):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+            rms = np.sqrt(sum_squares / count)
+        columns = {"window_start": (indices * window).tolist(), "window_end": ((indices + 1) * window).tolist()}
+        for row, channel in enumerate(self.channels):
+            statistics = {"count": count[row], "mean": mean[row], "min": minimum[row], "max": maximum[row], "rms": rms[row]}
+            for name in STATISTICS:
+                columns[f"AIN{channel}_{name}"] = statistics[name].tolist()
+        self.windows_emitted[window] += len(indices)
+
+        if self.on_windows is not None:
+            self.on_windows(window, columns)
+        sink = self.sinks.get(window)
+        if sink is not None:
+            sink.write_batch(columns)
+
+    def flush(self):
+        """
+        Emit the windows still being filled, e.g. at the end of a run.
+        """
+        with self._lock:
+            for window, partial in self._partials.items():
+                if partial.index is None:
+                    continue
+                self._emit(window, np.array([partial.index]), partial.count[:, np.newaxis], partial.sum[:, np.newaxis],
+                           partial.sum_squares[:, np.newaxis], partial.min[:, np.newaxis], partial.max[:, np.newaxis])
+                self._partials[window] = _Partial(len(self.channels))
@@ -0,0 +1,122 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+
+from .LabJackT7Driver import LabJackT7Driver
+
+
+class AsyncLabJackT7Driver:
+    """
+    asyncio wrapper around LabJackT7Driver.
+
+    Every blocking ljm call runs on a bounded executor so the event loop is never blocked
+    by network round trips. By default each device gets a single worker thread, which
+    keeps calls on one handle in order; pass a shared executor to cap the number of
+    threads across many devices.
+
+        async with AsyncLabJackT7Driver(ip_address="172.18.120.132") as labjack:
+            values = await labjack.read_samples()
+    """
+
+    def __init__(self, driver=None, executor=None, **driver_kwargs):
+        self.driver = driver if driver is not None else LabJackT7Driver(**driver_kwargs)
+        self._owns_executor = executor is None
+        self._executor = executor or concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="AsyncLabJack"
+        )
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run a blocking callable on the driver's executor and await its result.
+        Cancelling the awaiting task stops waiting; a call already in progress finishes
+        on its worker thread.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def start(self):
+        await self.run(self.driver.start)
+
+    async def stop(self):
+        # Run outside the device executor so it can wake a read_stream() blocked on it
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.driver.stop)
+
+    async def close(self):
+        try:
+            if self.driver.get_stream_status().get("running"):
+                await self.stop()
+            await self.run(self.driver.close)
+        finally:
+            if self._owns_executor:
+                self._executor.shutdown(wait=False)
+
+    async def read_samples(self):
+        return await self.run(self.driver.read_samples)
+
+    async def set_range(self, channel, voltage_range):
+        await self.run(self.driver.set_range, channel, voltage_range)
+
+    async def configure_measurement_type(self, channel, measurement_type="single-ended", differential_negative_channel=None):
+        await self.run(self.driver.configure_measurement_type, channel, measurement_type, differential_negative_channel)
+
+    async def set_channel_rms(self, channel, rms_enabled, num_scans=200, scan_time_microseconds=10000):
+        await self.run(self.driver.set_channel_rms, channel, rms_enabled, num_scans, scan_time_microseconds)
+
+    async def set_scaling_factor(self, channel, scaling_factor):
+        await self.run(self.driver.set_scaling_factor, channel, scaling_factor)
+
+    async def begin(self):
+        await self.run(self.driver.begin)
+
+    async def commit(self):
+        return await self.run(self.driver.commit)
+
+    async def discard(self):
+        await self.run(self.driver.discard)
+
+    @contextlib.asynccontextmanager
+    async def configuration(self):
+        """
+        Async counterpart of LabJackT7Driver.configuration(): the awaited setters in the
+        block are staged and sent in one batch on exit, or discarded if the block raises.
+
+            async with labjack.configuration():
+                await labjack.set_range(0, "10V")
+                await labjack.set_channel_rms(0, True)
+        """
+        await self.begin()
+        try:
+            yield self
+        except BaseException:
+            await self.discard()
+            raise
+        await self.commit()
+
+    async def start_stream(self, scan_rate, scans_per_read=None, channels=None, max_buffered_blocks=1000):
+        return await self.run(self.driver.start_stream, scan_rate, scans_per_read, channels, max_buffered_blocks)
+
+    async def read_stream(self, timeout=None):
+        return await self.run(self.driver.read_stream, timeout)
+
+    async def stream(self, poll_interval=0.1):
+        """
+        Async iterator over streamed data. Each item is the read_stream() dict of the
+        scans that arrived since the previous item; empty polls are not yielded. The
+        executor wait is bounded by poll_interval so cancellation takes effect promptly.
+        Iteration ends when the stream stops.
+        """
+        while True:
+            data = await self.read_stream(timeout=poll_interval)
+            if any(len(values) for values in data.values()):
+                yield data
+            elif not self.driver.get_stream_status().get("running"):
+                return
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -0,0 +1,114 @@
+import numpy as np
+
+
+def compute_statistics(data):
+    """
+    Compute per-channel statistics over a block of samples in one vectorized pass.
+
+    NaN samples (skipped stream samples) are ignored. The period-aligned RMS is taken
+    between the first and last rising crossing of each channel's mean, so it covers a
+    whole number of periods; channels without two rising crossings get NaN there, which
+    is the host-side equivalent of AIN_EF_COULD_NOT_FIND_PERIOD.
+
+    :param data: Array of shape (channels, samples)
+    :return: Dict of arrays, one value per channel: mean, rms, min, max, peak,
+        period_rms, periods and count
+    """
+    data = np.asarray(data, dtype=np.float64)
+    if data.ndim == 1:
+        data = data[np.newaxis, :]
+    num_channels, num_samples = data.shape
+
+    valid = ~np.isnan(data)
+    count = valid.sum(axis=1)
+    if num_samples == 0 or not count.any():
+        empty = np.full(num_channels, np.nan)
+        return {
+            "mean": empty, "rms": empty.copy(), "min": empty.copy(), "max": empty.copy(),
+            "peak": empty.copy(), "period_rms": empty.copy(), "periods": np.zeros(num_channels, dtype=np.int64),
+            "count": count,
+        }
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        filled = np.where(valid, data, 0.0)
+        mean = filled.sum(axis=1) / count
+        squares = filled * filled
+        rms = np.sqrt(squares.sum(axis=1) / count)
+        minimum = np.where(valid, data, np.inf).min(axis=1)
+        maximum = np.where(valid, data, -np.inf).max(axis=1)
+        peak = np.maximum(np.abs(minimum), np.abs(maximum))
+
+        # Rising crossings of the channel mean; NaN samples are treated as sitting on the mean
+        above = np.where(valid, data, mean[:, np.newaxis]) > mean[:, np.newaxis]
+        rising = ~above[:, :-1] & above[:, 1:]
+        crossings = rising.sum(axis=1)
+        # rising[k] is a crossing between samples k and k + 1, so the periods span the
+        # samples after the first crossing up to and including the one before the last
+        first = np.argmax(rising, axis=1) + 1
+        last = num_samples - 1 - np.argmax(rising[:, ::-1], axis=1)
+        index = np.arange(num_samples)
+        in_periods = (index >= first[:, np.newaxis]) & (index < last[:, np.newaxis]) & valid
+        period_count = in_periods.sum(axis=1)
+        period_rms = np.sqrt(np.where(in_periods, squares, 0.0).sum(axis=1) / period_count)
+        period_rms[crossings < 2] = np.nan
+
+    minimum[count == 0] = np.nan
+    maximum[count == 0] = np.nan
+    peak[count == 0] = np.nan
+    return {
+        "mean": mean,
+        "rms": rms,
+        "min": minimum,
+        "max": maximum,
+        "peak": peak,
+        "period_rms": period_rms,
+        "periods": np.maximum(crossings - 1, 0),
+        "count": count,
+    }
+
+
+class WindowStatistics:
+    """
+    Rolling window of the most recent samples for a set of channels, with statistics
+    recomputed over the whole window on demand.
+
+    :param channels: Channel numbers, in the row order of the data passed to update()
+    :param scan_rate: Samples per second per channel
+    :param window_seconds: Length of the window the statistics are computed over
+    """
+
+    def __init__(self, channels, scan_rate, window_seconds=0.1):
+        self.channels = list(channels)
+        self.scan_rate = scan_rate
+        self.window_seconds = window_seconds
+        self.window_scans = max(2, int(round(scan_rate * window_seconds)))
+        self._window = np.full((len(self.channels), self.window_scans), np.nan, dtype=np.float64)
+        self.total_scans = 0
+
+    def update(self, data):
+        """
+        Shift new samples into the window.
+
+        :param data: Array of shape (channels, n), or a read_stream()-style dict of "AIN#" arrays
+        """
+        if isinstance(data, dict):
+            data = np.vstack([np.asarray(data[f"AIN{channel}"], dtype=np.float64) for channel in self.channels])
+        n = data.shape[1]
+        if n == 0:
+            return
+        if n >= self.window_scans:
+            self._window[:] = data[:, -self.window_scans:]
+        else:
+            self._window[:, :-n] = self._window[:, n:]
+            self._window[:, -n:] = data
+        self.total_scans += n
+
+    def compute(self):
+        """
+        :return: Dict mapping "AIN#" to a dict of that channel's statistics
+        """
+        stats = compute_statistics(self._window)
+        return {
+            f"AIN{channel}": {name: values[index].item() for name, values in stats.items()}
+            for index, channel in enumerate(self.channels)
+        }
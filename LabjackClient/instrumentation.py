@@ -0,0 +1,207 @@
+import bisect
+import re
+import threading
+import time
+
+from labjack import ljm
+
+# Upper bounds in seconds of the latency histogram buckets, from sub-millisecond USB
+# round trips up to multi-second FlexRMS windows and timeouts
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# ljm functions timed by InstrumentedLJM besides the e* read/write/stream calls
+_LJM_CALLS = {"open", "openS", "openAll", "close", "closeAll", "getHandleInfo", "namesToAddresses", "nameToAddress"}
+_E_CALL = re.compile(r"^e[A-Z]")
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram. Recording a value is one bisect and two additions,
+    so it can stay on in the read path.
+
+    :param buckets: Sorted bucket upper bounds in seconds; an implicit +Inf bucket is added
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, duration):
+        self.counts[bisect.bisect_left(self.buckets, duration)] += 1
+        self.count += 1
+        self.sum += duration
+        if duration > self.max:
+            self.max = duration
+
+    def quantile(self, q):
+        """
+        Estimate a quantile as the upper bound of the bucket it falls in (max for +Inf).
+        """
+        if not self.count:
+            return float("nan")
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        cumulative = 0
+        buckets = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            buckets.append((bound, cumulative))
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else float("nan"),
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+class Instrumentation:
+    """
+    Latency histograms per ljm operation, per channel and per scan, plus LJM error counts
+    by error code, for one driver.
+
+    :param buckets: Histogram bucket upper bounds in seconds
+    :param labels: Constant labels added to every exported Prometheus sample, e.g. {"serial": "470012345"}
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, labels=None):
+        self.buckets = tuple(buckets)
+        self.labels = dict(labels or {})
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = {}  # ljm function name -> LatencyHistogram
+            self.channels = {}  # Channel number -> LatencyHistogram of the call that returned the channel's value
+            self.scans = LatencyHistogram(self.buckets)  # read_samples() durations
+            self.errors = {}  # LJM error code -> count
+
+    def record_call(self, operation, duration):
+        with self._lock:
+            histogram = self.calls.get(operation)
+            if histogram is None:
+                histogram = self.calls[operation] = LatencyHistogram(self.buckets)
+            histogram.record(duration)
+
+    def record_channels(self, channels, duration):
+        with self._lock:
+            for channel in channels:
+                histogram = self.channels.get(channel)
+                if histogram is None:
+                    histogram = self.channels[channel] = LatencyHistogram(self.buckets)
+                histogram.record(duration)
+
+    def record_scan(self, duration):
+        with self._lock:
+            self.scans.record(duration)
+
+    def record_error(self, error_code):
+        with self._lock:
+            self.errors[error_code] = self.errors.get(error_code, 0) + 1
+
+    def snapshot(self):
+        """
+        :return: Dict with "calls" and "channels" (name -> histogram summary), "scans"
+            (histogram summary) and "errors" (LJM error code -> count)
+        """
+        with self._lock:
+            return {
+                "calls": {operation: histogram.snapshot() for operation, histogram in self.calls.items()},
+                "channels": {
+                    f"AIN{channel}": histogram.snapshot() for channel, histogram in sorted(self.channels.items())
+                },
+                "scans": self.scans.snapshot(),
+                "errors": dict(self.errors),
+            }
+
+    def to_prometheus(self, prefix="labjack"):
+        """
+        Render the current snapshot in the Prometheus text exposition format.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        histograms = (
+            ("ljm_call_duration_seconds", "Latency of ljm calls by operation", "operation", snapshot["calls"]),
+            ("channel_read_duration_seconds", "Latency of the ljm call that read each channel", "channel",
+             snapshot["channels"]),
+            ("scan_duration_seconds", "Duration of read_samples() scans", None, {None: snapshot["scans"]}),
+        )
+        for name, help_text, label, histograms_by_label in histograms:
+            metric = f"{prefix}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for label_value, histogram in sorted(histograms_by_label.items(), key=lambda item: str(item[0])):
+                labels = dict(self.labels)
+                if label is not None:
+                    labels[label] = label_value
+                for bound, cumulative in histogram["buckets"]:
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{metric}_bucket{_format_labels(dict(labels, le=le))} {cumulative}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {histogram['sum']!r}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {histogram['count']}")
+
+        metric = f"{prefix}_ljm_errors_total"
+        lines.append(f"# HELP {metric} LJM errors by error code")
+        lines.append(f"# TYPE {metric} counter")
+        for code, count in sorted(snapshot["errors"].items()):
+            lines.append(f"{metric}{_format_labels(dict(self.labels, code=code))} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class InstrumentedLJM:
+    """
+    Wrapper around labjack.ljm (or a compatible backend) that times every ljm call and
+    counts LJMErrors by error code in an Instrumentation. Everything else (constants,
+    errorcodes, LJMError, simulator controls) is passed through untouched.
+    """
+
+    def __init__(self, backend, instrumentation):
+        self.backend = backend
+        self.instrumentation = instrumentation
+
+    def __getattr__(self, name):
+        attribute = getattr(self.backend, name)
+        if not callable(attribute) or not (name in _LJM_CALLS or _E_CALL.match(name)):
+            return attribute
+
+        instrumentation = self.instrumentation
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            started = clock()
+            try:
+                return attribute(*args, **kwargs)
+            except ljm.LJMError as e:
+                instrumentation.record_error(e.errorCode)
+                raise
+            finally:
+                instrumentation.record_call(name, clock() - started)
+
+        timed.__name__ = name
+        setattr(self, name, timed)  # Cache so later lookups skip __getattr__
+        return timed
@@ -0,0 +1,151 @@
+import concurrent.futures
+import logging
+import time
+
+from .LabJackT7Driver import LabJackT7Driver
+
+logger = logging.getLogger(__name__)
+
+
+def is_labjack_entry(hardware_config):
+    """
+    Return True if an entry of the YAML `hardware` list describes a LabJack device.
+    """
+    return str(hardware_config.get("name", "")).lower().startswith("labjack")
+
+
+def parse_channel_number(channel_key):
+    """
+    Convert a YAML channel key such as "Channel 2" (or a bare 2) to its channel number.
+    """
+    if isinstance(channel_key, int):
+        return channel_key
+    return int(str(channel_key).split()[-1])
+
+
+def configure_driver(driver, hardware_config):
+    """
+    Apply the `Channels` section of a hardware entry to an open driver in one
+    configuration batch.
+
+    :return: Dict mapping channel number to its configured name
+    """
+    channel_names = {}
+    with driver.configuration():
+        for channel_key, channel_config in (hardware_config.get("Channels") or {}).items():
+            channel = parse_channel_number(channel_key)
+            channel_names[channel] = channel_config.get("name", f"AIN{channel}")
+
+            if channel_config.get("type", "single-ended") == "differential":
+                driver.configure_measurement_type(
+                    channel, measurement_type="differential",
+                    differential_negative_channel=channel_config["negative_channel"],
+                )
+            else:
+                driver.configure_measurement_type(channel, measurement_type="single-ended")
+
+            driver.set_channel_rms(channel, bool(channel_config.get("RMS", False)))
+            if "scaling_factor" in channel_config:
+                driver.set_scaling_factor(channel, channel_config["scaling_factor"])
+    return channel_names
+
+
+class LabJackManager:
+    """
+    Open every LabJack listed in the `hardware` section of the config and poll them
+    concurrently. Each device is read on its own worker thread (LJM releases the GIL
+    while waiting on the network), so a scan takes roughly as long as the slowest
+    device rather than the sum of all devices.
+    """
+
+    def __init__(self, hardware_configs, max_workers=None, backend=None):
+        self.hardware_configs = [config for config in hardware_configs if is_labjack_entry(config)]
+        self.devices = {}  # Device name -> LabJackT7Driver
+        self.channel_names = {}  # Device name -> {channel number: channel name}
+        self.last_scan_duration = None
+        self.last_device_durations = {}
+        self._max_workers = max_workers
+        self._backend = backend
+        self._executor = None
+
+    @classmethod
+    def from_config(cls, config, max_workers=None, backend=None):
+        return cls(config.get("hardware") or [], max_workers=max_workers, backend=backend)
+
+    def _device_name(self, hardware_config):
+        # Entries often share the name "LabJack"; disambiguate those by IP address
+        name = hardware_config.get("name", "LabJack")
+        if sum(config.get("name") == name for config in self.hardware_configs) > 1:
+            name = f"{name}_{hardware_config['IP']}"
+        return name
+
+    def start(self):
+        """
+        Open and configure all devices concurrently.
+        """
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_workers or max(1, len(self.hardware_configs)),
+            thread_name_prefix="LabJackManager",
+        )
+        for hardware_config in self.hardware_configs:
+            driver = LabJackT7Driver(
+                ip_address=hardware_config["IP"],
+                voltage_range=hardware_config.get("Voltage_range", "-1V"),
+                backend=self._backend,
+            )
+            self.devices[self._device_name(hardware_config)] = driver
+
+        futures = {
+            name: self._executor.submit(self._start_device, driver, hardware_config)
+            for (name, driver), hardware_config in zip(self.devices.items(), self.hardware_configs)
+        }
+        for name, future in futures.items():
+            self.channel_names[name] = future.result()
+            logger.info("Started %s with channels %s", name, self.channel_names[name])
+
+    @staticmethod
+    def _start_device(driver, hardware_config):
+        driver.start()
+        return configure_driver(driver, hardware_config)
+
+    @staticmethod
+    def _timed_read(driver):
+        started = time.perf_counter()
+        values = driver.read_samples()
+        return values, time.perf_counter() - started
+
+    def read_samples(self):
+        """
+        Read all devices concurrently and merge the results into one frame.
+
+        :return: Dict with a "timestamp" key (scan start, seconds since the epoch) and one
+            "<device>/<channel name>" key per configured channel. Channels of a device whose
+            read failed are set to None.
+        """
+        timestamp = time.time()
+        started = time.perf_counter()
+        futures = {name: self._executor.submit(self._timed_read, driver) for name, driver in self.devices.items()}
+
+        frame = {"timestamp": timestamp}
+        for name, future in futures.items():
+            try:
+                values, duration = future.result()
+                self.last_device_durations[name] = duration
+            except Exception as e:
+                logger.error("Error reading from %s: %s", name, e)
+                values = {}
+            for channel, channel_name in self.channel_names[name].items():
+                frame[f"{name}/{channel_name}"] = values.get(f"AIN{channel}")
+
+        self.last_scan_duration = time.perf_counter() - started
+        return frame
+
+    def close(self):
+        for name, driver in self.devices.items():
+            try:
+                driver.close()
+            except Exception as e:
+                logger.warning("Error closing %s: %s", name, e)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,285 @@
+import json
+import struct
+import threading
+import time
+
+import numpy as np
+from labjack import ljm
+
+from .simulator import SimulatedLJM
+
+MAGIC = b"LJREC\x00\x01\x00"
+_HEADER_LENGTH = struct.Struct("<I")
+_ALIGNMENT = 8
+
+
+class EndOfRecording(ljm.LJMError):
+    """
+    Raised by ReplayLJM once a recording without loop=True has been played to the end.
+    LabJackT7Driver.read_samples() lets it propagate so replay loops can finish.
+    """
+
+
+def record_dtype(num_channels, dtype="float32"):
+    """
+    NumPy structured dtype of one fixed-size scan record: a float64 timestamp
+    followed by one value per channel.
+    """
+    return np.dtype([("timestamp", "<f8"), ("values", np.dtype(dtype).newbyteorder("<"), (num_channels,))])
+
+
+class ScanRecorder:
+    """
+    Append-only binary recording of scans.
+
+    File layout: 8-byte magic, uint32 header length, a UTF-8 JSON header (channel config,
+    value dtype, device info) padded to an 8-byte boundary, then fixed-size records of
+    record_dtype(). Records can be appended for as long as the run lasts and the file can
+    be read with RecordingReader while it is still being written.
+
+    :param path: Output file path (overwritten)
+    :param channels: List of per-channel dicts (channel, name, range, negative_channel,
+        scaling_factor, rms); the record has one value per entry, in this order
+    :param dtype: "float32" (default, half the size) or "float64"
+    :param metadata: Extra JSON-serializable header fields
+    """
+
+    def __init__(self, path, channels, dtype="float32", metadata=None):
+        if np.dtype(dtype) not in (np.float32, np.float64):
+            raise ValueError(f"Invalid recording dtype: {dtype}. Use 'float32' or 'float64'.")
+        self.path = path
+        self.channels = list(channels)
+        self.dtype = record_dtype(len(self.channels), dtype)
+        self.records_written = 0
+        self._lock = threading.Lock()
+
+        header = dict(metadata or {})
+        header.update({"version": 1, "value_dtype": np.dtype(dtype).name, "channels": self.channels})
+        header_bytes = json.dumps(header).encode("utf-8")
+        prefix_length = len(MAGIC) + _HEADER_LENGTH.size
+        header_bytes += b" " * (-(prefix_length + len(header_bytes)) % _ALIGNMENT)
+
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._file.write(_HEADER_LENGTH.pack(len(header_bytes)))
+        self._file.write(header_bytes)
+
+    def append(self, timestamp, values):
+        """
+        Append one scan.
+
+        :param values: One value per recorded channel
+        """
+        self.append_block((timestamp,), np.asarray(values, dtype=np.float64)[:, np.newaxis])
+
+    def append_block(self, timestamps, values, rows=None):
+        """
+        Append a block of scans in one write.
+
+        :param timestamps: n timestamps
+        :param values: Array of shape (len(rows), n)
+        :param rows: Indices of the recorded channels the value rows belong to (default: all);
+            the other channels are recorded as NaN
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        records = np.empty(timestamps.shape[0], dtype=self.dtype)
+        records["timestamp"] = timestamps
+        if rows is None:
+            records["values"] = np.asarray(values).T
+        else:
+            records["values"] = np.nan
+            records["values"][:, rows] = np.asarray(values).T
+        with self._lock:
+            self._file.write(records.tobytes())
+            self.records_written += len(records)
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class RecordingReader:
+    """
+    Memory-mapped reader for files written by ScanRecorder.
+
+    timestamps and values are zero-copy NumPy views of the file: values has shape
+    (scans, channels) and can be indexed or sliced at random without reading the
+    whole recording. Call refresh() to pick up records appended since opening.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as recording_file:
+            magic = recording_file.read(len(MAGIC))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a LabJack recording")
+            (header_length,) = _HEADER_LENGTH.unpack(recording_file.read(_HEADER_LENGTH.size))
+            self.header = json.loads(recording_file.read(header_length).decode("utf-8"))
+        self.channels = self.header["channels"]
+        self.dtype = record_dtype(len(self.channels), self.header["value_dtype"])
+        self.data_offset = len(MAGIC) + _HEADER_LENGTH.size + header_length
+        self._records = None
+        self.refresh()
+
+    def refresh(self):
+        """
+        Re-map the file so records appended since the last refresh become visible.
+        A partially written trailing record is ignored.
+        """
+        with open(self.path, "rb") as recording_file:
+            recording_file.seek(0, 2)
+            size = recording_file.tell()
+        count = max(0, size - self.data_offset) // self.dtype.itemsize
+        if count:
+            self._records = np.memmap(self.path, dtype=self.dtype, mode="r", offset=self.data_offset, shape=(count,))
+        else:
+            self._records = np.empty(0, dtype=self.dtype)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, index):
+        return self._records[index]
+
+    @property
+    def timestamps(self):
+        return self._records["timestamp"]
+
+    @property
+    def values(self):
+        return self._records["values"]
+
+    def channel_index(self, channel):
+        """
+        Column index of a channel given its number (e.g. 2), "AIN#" key or configured name.
+        """
+        for index, config in enumerate(self.channels):
+            if channel in (config.get("channel"), config.get("name"), f"AIN{config.get('channel')}"):
+                return index
+        raise KeyError(f"Channel {channel} is not in the recording")
+
+    def channel(self, channel):
+        """
+        Zero-copy view of one channel's values over the whole recording.
+        """
+        return self.values[:, self.channel_index(channel)]
+
+    def apply_channel_config(self, driver):
+        """
+        Configure a driver with the channel settings stored in the header, e.g. before
+        replaying the recording through ReplayLJM.
+        """
+        with driver.configuration():
+            for config in self.channels:
+                channel = config["channel"]
+                if config.get("range") is not None:
+                    driver.set_range(channel, config["range"])
+                if config.get("negative_channel") is not None:
+                    measurement_type = "single-ended" if config["negative_channel"] == 199 else "differential"
+                    driver.configure_measurement_type(channel, measurement_type, config["negative_channel"])
+                if config.get("rms"):
+                    driver.set_channel_rms(channel, True)
+                driver.set_scaling_factor(channel, config.get("scaling_factor", 1))
+
+
+class ReplayLJM(SimulatedLJM):
+    """
+    ljm backend that plays a recording back through LabJackT7Driver, so read_samples()
+    consumers can be re-run against recorded data.
+
+    Each read_samples() (or any read touching AIN#/AIN#_EF_READ_A registers) returns the
+    next recorded scan; eStreamRead returns the next scans_per_read scans. Recorded values
+    are scaled, so they are divided by the recorded scaling factors and the driver's
+    scaling gives back the original values.
+
+    :param reader: RecordingReader (or a path to a recording)
+    :param speed: Playback speed relative to the recorded timestamps (2.0 = twice as fast);
+        None replays as fast as possible
+    :param loop: Start over at the end of the recording instead of raising EndOfRecording
+    """
+
+    def __init__(self, reader, speed=None, loop=False, **kwargs):
+        super().__init__(flexrms_blocking=False, **kwargs)
+        self.reader = reader if isinstance(reader, RecordingReader) else RecordingReader(reader)
+        self.speed = speed
+        self.loop = loop
+        self.position = 0  # Index of the next recorded scan
+        self._row = None
+        self._replay_start = None
+        self._columns = {config["channel"]: index for index, config in enumerate(self.reader.channels)}
+        scaling = np.array([config.get("scaling_factor", 1) or 1 for config in self.reader.channels], dtype=np.float64)
+        self._inverse_scaling = 1.0 / scaling
+
+    @property
+    def finished(self):
+        return not self.loop and self.position >= len(self.reader)
+
+    def _take(self, count):
+        """
+        Return the next count scans as (timestamps, raw values), pacing to the recorded timing.
+        """
+        total = len(self.reader)
+        if total == 0 or self.finished:
+            raise EndOfRecording(ljm.errorcodes.NO_SCANS_RETURNED, errorString="END_OF_RECORDING")
+        indices = np.arange(self.position, self.position + count)
+        if self.loop:
+            indices %= total
+        else:
+            indices = indices[indices < total]
+        self.position += len(indices)
+
+        timestamps = self.reader.timestamps[indices]
+        if self.speed:
+            if self._replay_start is None:
+                self._replay_start = (time.monotonic(), float(timestamps[0]))
+            started, first_timestamp = self._replay_start
+            delay = started + (float(timestamps[-1]) - first_timestamp) / self.speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return timestamps, self.reader.values[indices] * self._inverse_scaling
+
+    def _advance_for(self, addresses):
+        if any(self._channel_register(address)[1] in ("", "_EF_READ_A") for address in addresses):
+            self._row = self._take(1)[1][0]
+
+    def _input_voltage(self, channel, t):
+        if self._row is None or channel not in self._columns:
+            return float("nan")
+        return float(self._row[self._columns[channel]])
+
+    def _flexrms(self, channel, address):
+        return self._input_voltage(channel, None)
+
+    def eReadAddress(self, handle, address, dataType):
+        self._advance_for((address,))
+        return super().eReadAddress(handle, address, dataType)
+
+    def eReadAddresses(self, handle, numFrames, aAddresses, aDataTypes):
+        self._advance_for(aAddresses[:numFrames])
+        return super().eReadAddresses(handle, numFrames, aAddresses, aDataTypes)
+
+    def eReadName(self, handle, name):
+        self._advance_for((self._resolve(name)[0],))
+        return super().eReadName(handle, name)
+
+    def eReadNames(self, handle, numFrames, aNames):
+        self._advance_for([self._resolve(name)[0] for name in aNames[:numFrames]])
+        return super().eReadNames(handle, numFrames, aNames)
+
+    def eStreamRead(self, handle):
+        with self._lock:
+            stream = self._streams.get(handle)
+        if stream is None:
+            raise ljm.LJMError(ljm.errorcodes.STREAM_NOT_RUNNING, errorString="STREAM_NOT_RUNNING")
+        _, values = self._take(stream["scans_per_read"])
+        columns = [self._columns.get(self._channel_register(address)[0]) for address in stream["scan_list"]]
+        block = np.full((len(values), len(columns)), np.nan)
+        for position, column in enumerate(columns):
+            if column is not None:
+                block[:, position] = values[:, column]
+        block[np.isnan(block)] = ljm.constants.DUMMY_VALUE
+        return block.ravel().tolist(), 0, 0
@@ -0,0 +1,138 @@
+import threading
+
+import numpy as np
+
+
+class ScanRingBuffer:
+    """
+    Fixed-capacity ring buffer of acquired scans backed by preallocated NumPy arrays.
+
+    Timestamps are stored as float64 seconds and channel data as a (channels x samples)
+    float64 array. Every sample is written twice, at index i and i + capacity, so the most
+    recent N samples (N <= capacity) are always one contiguous slice and can be returned
+    as zero-copy views. Memory use is fixed at construction time.
+
+    Writers advance a monotonically increasing sample count. Consumers keep a cursor
+    (the count they have read up to) and call read_since() to get copies of everything
+    newer, or latest() for zero-copy views of the newest samples.
+    """
+
+    def __init__(self, capacity, num_channels):
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive.")
+        capacity = int(capacity)
+        self._setup(
+            np.full(2 * capacity, np.nan, dtype=np.float64),
+            np.full((int(num_channels), 2 * capacity), np.nan, dtype=np.float64),
+        )
+
+    def _setup(self, timestamps, data):
+        """
+        Initialize the ring on preallocated mirrored arrays of shapes (2 * capacity,) and
+        (channels, 2 * capacity), e.g. views into shared memory (see SharedScanPublisher).
+        """
+        self.capacity = timestamps.shape[0] // 2
+        self.num_channels = data.shape[0]
+        self.timestamps = timestamps
+        self.data = data
+        self.total_written = 0  # Number of samples ever written; also the cursor of the newest sample
+        self._lock = threading.Lock()
+        self._data_ready = threading.Condition(self._lock)
+
+    @property
+    def nbytes(self):
+        return self.timestamps.nbytes + self.data.nbytes
+
+    def __len__(self):
+        return min(self.total_written, self.capacity)
+
+    def write(self, timestamps, values, scaling_factors=None, rows=None):
+        """
+        Append a block of samples.
+
+        :param timestamps: Sequence of n timestamps (seconds)
+        :param values: Array-like of shape (len(rows), n) with raw channel values
+        :param scaling_factors: Optional per-row scaling factors, applied in one vectorized step
+        :param rows: Channel rows the values belong to (default: all rows); other rows get NaN
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+        n = timestamps.shape[0]
+        if n == 0:
+            return
+        if n > self.capacity:
+            # Only the newest `capacity` samples can survive; skip straight to them
+            skipped = n - self.capacity
+            timestamps = timestamps[skipped:]
+            values = values[:, skipped:]
+            with self._lock:
+                self.total_written += skipped
+            n = self.capacity
+
+        if scaling_factors is not None:
+            values = values * np.asarray(scaling_factors, dtype=np.float64)[:, np.newaxis]
+
+        with self._lock:
+            start = self.total_written % self.capacity
+            first = min(n, self.capacity - start)
+            for offset in (0, self.capacity):
+                self._store(start + offset, 0, first, timestamps, values, rows)
+                if first < n:
+                    self._store(offset, first, n, timestamps, values, rows)
+            self.total_written += n
+            self._data_ready.notify_all()
+
+    def _store(self, index, begin, end, timestamps, values, rows):
+        stop = index + (end - begin)
+        self.timestamps[index:stop] = timestamps[begin:end]
+        if rows is None:
+            self.data[:, index:stop] = values[:, begin:end]
+        else:
+            self.data[:, index:stop] = np.nan
+            self.data[rows, index:stop] = values[:, begin:end]
+
+    def _window(self, cursor, count):
+        start = cursor % self.capacity
+        timestamps = self.timestamps[start:start + count]
+        data = self.data[:, start:start + count]
+        timestamps.flags.writeable = False
+        data.flags.writeable = False
+        return timestamps, data
+
+    def latest(self, n=None):
+        """
+        Return zero-copy, read-only views of the newest n samples (default: all buffered).
+        The views are overwritten once the writer wraps past them.
+
+        :return: Tuple of (timestamps, data) with shapes (n,) and (channels, n)
+        """
+        with self._lock:
+            available = min(self.total_written, self.capacity)
+            n = available if n is None else min(int(n), available)
+            return self._window(self.total_written - n, n)
+
+    def read_since(self, cursor, timeout=None, max_samples=None):
+        """
+        Return copies of the samples written after cursor, blocking up to timeout seconds
+        until at least one is available. The copies are taken under the writer's lock, so
+        they stay valid after the writer wraps. If the consumer fell more than capacity
+        behind, the oldest samples still buffered are returned and the gap is reported as lost.
+
+        :param cursor: Value of total_written the caller has consumed up to (0 initially)
+        :param timeout: Seconds to wait for new data; None waits forever
+        :param max_samples: Upper bound on the number of samples returned
+        :return: Tuple of (timestamps, data, next_cursor, lost)
+        """
+        with self._lock:
+            if self.total_written <= cursor:
+                self._data_ready.wait_for(lambda: self.total_written > cursor, timeout)
+            oldest = max(0, self.total_written - self.capacity)
+            lost = max(0, oldest - cursor)
+            cursor = max(cursor, oldest)
+            count = self.total_written - cursor
+            if max_samples is not None:
+                count = min(count, int(max_samples))
+            timestamps, data = self._window(cursor, count)
+            return timestamps.copy(), data.copy(), cursor + count, lost
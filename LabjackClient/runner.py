@@ -0,0 +1,344 @@
+"""
+Run a YAML-configured acquisition: open the first LabJack in the `hardware` section,
+configure its channels, poll it at `sampling_frequency` and write every scan to the
+sinks in the `output` section.
+
+While running, the config file is re-read whenever it changes. Only the channel
+settings that differ from the running config are re-applied to the device, in one
+batch, so the acquisition continues without a restart.
+
+    labjack-run config.yaml
+"""
+import argparse
+import collections
+import datetime
+import logging
+import os
+import time
+
+import yaml
+
+from .LabJackT7Driver import LabJackT7Driver
+from .manager import is_labjack_entry, parse_channel_number
+from .scheduler import FixedRateScheduler, parse_frequency
+from .sinks import build_sinks
+
+logger = logging.getLogger(__name__)
+
+# Validated settings of one configured channel
+ChannelConfig = collections.namedtuple(
+    "ChannelConfig", ["name", "measurement_type", "negative_channel", "rms", "scaling_factor"]
+)
+
+# Settings a channel is returned to when it is removed from the config
+_UNCONFIGURED = ChannelConfig(None, "single-ended", 199, False, 1)
+
+
+def load_config(path):
+    """
+    Read and validate a config.yaml file. See validate_config().
+    """
+    with open(path, "r") as yaml_file:
+        return validate_config(yaml.safe_load(yaml_file))
+
+
+def validate_config(config):
+    """
+    Check a parsed config.yaml and normalize it for the runner.
+
+    :return: Dict with test_name, sampling_frequency (Hz), output, and device: the first
+        LabJack hardware entry as a dict with name, ip, voltage_range and channels
+        (channel number -> ChannelConfig)
+    :raises ValueError: Listing every problem found
+    """
+    if not isinstance(config, dict):
+        raise ValueError("Invalid config: expected a mapping at the top level.")
+    errors = []
+
+    try:
+        sampling_frequency = parse_frequency(config.get("sampling_frequency", "1Hz"))
+        if sampling_frequency <= 0:
+            errors.append("sampling_frequency must be positive.")
+    except ValueError:
+        sampling_frequency = None
+        errors.append(f"Invalid sampling_frequency: {config.get('sampling_frequency')}")
+
+    entries = [entry for entry in config.get("hardware") or [] if isinstance(entry, dict) and is_labjack_entry(entry)]
+    if not entries:
+        raise ValueError("Invalid config: no LabJack entry in the hardware section.")
+    entry = entries[0]
+
+    if not entry.get("IP"):
+        errors.append("LabJack entry has no IP.")
+    voltage_range = str(entry.get("Voltage_range", "-1V"))
+    if voltage_range not in LabJackT7Driver.voltage_ranges:
+        errors.append(f"Invalid Voltage_range: {voltage_range}. Use one of {list(LabJackT7Driver.voltage_ranges)}.")
+
+    channels = {}
+    for channel_key, channel_config in (entry.get("Channels") or {}).items():
+        try:
+            channel = parse_channel_number(channel_key)
+        except ValueError:
+            errors.append(f"Invalid channel key: {channel_key}. Use 'Channel <number>'.")
+            continue
+        if channel in channels:
+            errors.append(f"Channel {channel} is configured more than once.")
+            continue
+        channel_config = channel_config or {}
+
+        measurement_type = channel_config.get("type", "single-ended")
+        negative_channel = 199
+        if measurement_type == "differential":
+            negative_channel = channel_config.get("negative_channel")
+            if not isinstance(negative_channel, int):
+                errors.append(f"{channel_key}: differential channels need an integer negative_channel.")
+        elif measurement_type != "single-ended":
+            errors.append(f"{channel_key}: invalid type {measurement_type}. Use 'single-ended' or 'differential'.")
+
+        rms = channel_config.get("RMS", False)
+        if not isinstance(rms, bool):
+            errors.append(f"{channel_key}: RMS must be true or false.")
+        scaling_factor = channel_config.get("scaling_factor", 1)
+        if not isinstance(scaling_factor, (int, float)) or isinstance(scaling_factor, bool):
+            errors.append(f"{channel_key}: scaling_factor must be a number.")
+
+        channels[channel] = ChannelConfig(
+            channel_config.get("name", f"AIN{channel}"), measurement_type, negative_channel, rms, scaling_factor
+        )
+
+    if errors:
+        raise ValueError("Invalid config:\n  " + "\n  ".join(errors))
+    return {
+        "test_name": config.get("test_name", "LabJack"),
+        "sampling_frequency": sampling_frequency,
+        "output": config.get("output") or {},
+        "device": {
+            "name": entry.get("name", "LabJack"),
+            "ip": entry["IP"],
+            "voltage_range": voltage_range,
+            "channels": channels,
+        },
+    }
+
+
+def apply_channel_changes(driver, old_channels, new_channels):
+    """
+    Apply only the channel settings that differ between two validated channel maps, in
+    one configuration batch. Channels missing from new_channels go back to single-ended
+    without RMS or scaling.
+
+    :return: Sorted list of the channels that were changed
+    """
+    changed = []
+    with driver.configuration():
+        for channel in sorted(set(old_channels) | set(new_channels)):
+            before = old_channels.get(channel)
+            after = new_channels.get(channel, _UNCONFIGURED)
+            if before == after:
+                continue
+            if before is None or (before.measurement_type, before.negative_channel) != (
+                after.measurement_type, after.negative_channel
+            ):
+                driver.configure_measurement_type(
+                    channel, measurement_type=after.measurement_type,
+                    differential_negative_channel=after.negative_channel,
+                )
+            if before is None or before.rms != after.rms:
+                driver.set_channel_rms(channel, after.rms)
+            if before is None or before.scaling_factor != after.scaling_factor:
+                driver.set_scaling_factor(channel, after.scaling_factor)
+            changed.append(channel)
+    return changed
+
+
+class AcquisitionRunner:
+    """
+    Poll one LabJack according to a config.yaml and hot-reload the file while running.
+
+    :param config_path: Path of the YAML config
+    :param backend: Optional ljm backend (e.g. SimulatedLJM) passed to the driver
+    :param output_dir: Directory the output files are written to
+    :param reload_interval: Seconds between checks of the config file for changes (None: no reload)
+    :param display: Print each scan to the console
+    """
+
+    def __init__(self, config_path, backend=None, output_dir=".", reload_interval=1.0, display=True):
+        self.config_path = config_path
+        self.backend = backend
+        self.output_dir = output_dir
+        self.reload_interval = reload_interval
+        self.display = display
+        self.config = None
+        self.driver = None
+        self.scheduler = None
+        self.sinks = []
+        self.count = 0
+        self.reloads = 0
+        self._config_mtime = None
+        self._next_reload_check = None
+        self._time_start = None
+
+    def start(self):
+        self._config_mtime = os.stat(self.config_path).st_mtime_ns
+        self.config = load_config(self.config_path)
+        device = self.config["device"]
+
+        self.driver = LabJackT7Driver(
+            ip_address=device["ip"], voltage_range=device["voltage_range"], backend=self.backend
+        )
+        self.driver.start()
+        apply_channel_changes(self.driver, {}, device["channels"])
+
+        self.sinks = build_sinks(self.config["output"], os.path.join(self.output_dir, self.config["test_name"]))
+        self.scheduler = FixedRateScheduler(
+            self.driver.read_samples, self.config["sampling_frequency"], on_sample=self._handle_sample
+        )
+        self._time_start = datetime.datetime.now(datetime.timezone.utc)
+        self._next_reload_check = time.monotonic() + (self.reload_interval or 0)
+
+    def run(self, max_iterations=None, duration=None):
+        """
+        Start if needed and acquire until interrupted (or for max_iterations / duration),
+        then close the device and flush the sinks.
+        """
+        if self.driver is None:
+            self.start()
+        try:
+            self.scheduler.run(max_iterations=max_iterations, duration=duration)
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Flush the sinks and close the device. Safe to call after a start() that failed part way.
+        """
+        try:
+            for sink in self.sinks:
+                sink.close()
+        finally:
+            self.sinks = []
+            if self.driver is not None:
+                self.driver.close()
+
+    def check_reload(self):
+        """
+        Re-read the config file if it changed since it was last loaded and apply the
+        differences. An invalid file is reported and the running config is kept; so is
+        one the device could not be configured with, which is retried on the next check.
+
+        :return: True if a new config was applied
+        """
+        try:
+            mtime = os.stat(self.config_path).st_mtime_ns
+        except OSError as e:
+            logger.warning("Could not check %s for changes: %s", self.config_path, e)
+            return False
+        if mtime == self._config_mtime:
+            return False
+        self._config_mtime = mtime
+
+        try:
+            config = load_config(self.config_path)
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            logger.error("Not reloading %s, keeping the running config: %s", self.config_path, e)
+            return False
+        try:
+            self.apply_config(config)
+        except Exception as e:  # The driver's Exception when the configuration cannot be committed
+            # Keep the running config and re-read the file on the next check to retry the edit
+            self._config_mtime = None
+            logger.error("Could not apply %s, will retry: %s", self.config_path, e)
+            return False
+        return True
+
+    def apply_config(self, config):
+        """
+        Apply a validated config to the running acquisition, touching only what changed.
+        """
+        old_device, new_device = self.config["device"], config["device"]
+        if new_device["ip"] != old_device["ip"]:
+            logger.warning("IP changed to %s; restart the runner to connect to it.", new_device["ip"])
+        if config["output"] != self.config["output"] or config["test_name"] != self.config["test_name"]:
+            logger.warning("Output settings changed; they take effect when the runner is restarted.")
+
+        with self.driver.configuration():
+            if new_device["voltage_range"] != old_device["voltage_range"]:
+                self.driver.voltage_range = new_device["voltage_range"]
+                for channel in range(self.driver.num_analog_inputs):
+                    self.driver.set_range(channel, new_device["voltage_range"])
+            changed = apply_channel_changes(self.driver, old_device["channels"], new_device["channels"])
+
+        if config["sampling_frequency"] != self.config["sampling_frequency"]:
+            self.scheduler.set_rate(config["sampling_frequency"])
+        # Keep the settings that need a restart as they are actually running
+        new_device = dict(new_device, ip=old_device["ip"])
+        self.config = dict(config, device=new_device, output=self.config["output"], test_name=self.config["test_name"])
+        self.reloads += 1
+        logger.info("Reloaded %s, re-applied channels %s", self.config_path, changed)
+
+    def _handle_sample(self, analog_values, scheduled_time):
+        now = datetime.datetime.now()
+        row = {"Timestamp": int(time.time()), "time": now.isoformat()}
+        # Every configured channel gets a column, so the sinks only start new files when the channels change
+        for channel, channel_config in self.config["device"]["channels"].items():
+            row[channel_config.name] = analog_values.get(f"AIN{channel}")
+        for sink in self.sinks:
+            sink.write(row)
+        if self.display:
+            self._print_row(row)
+        self.count += 1
+
+        if self.reload_interval is not None and time.monotonic() >= self._next_reload_check:
+            self._next_reload_check = time.monotonic() + self.reload_interval
+            self.check_reload()
+
+    def _print_row(self, row):
+        os.system("cls" if os.name == "nt" else "clear")
+        elapsed_time = datetime.datetime.now(datetime.timezone.utc) - self._time_start
+        print("To stop data acquisition, type: CTRL+C\n")
+        print(
+            f"count: \t{self.count}\tTime Started: \t{self._time_start.isoformat()}"
+            f"\tElapsed Time: \t{str(elapsed_time).split('.')[0]}\n"
+        )
+        print("Channel Data: ")
+        channel_values = [(name, value) for name, value in row.items() if name not in ("Timestamp", "time")]
+        for index, (name, value) in enumerate(channel_values, 1):
+            print(f"{name}:\t{value}\t", end="")
+            if index % 4 == 0:  # Print a newline after every 4th item
+                print("\n", end="")
+        print("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("config", nargs="?", default="config.yaml", help="YAML config file")
+    parser.add_argument("--output-dir", default=".", help="Directory to write output files to")
+    parser.add_argument("--reload-interval", type=float, default=1.0,
+                        help="Seconds between checks of the config file for changes")
+    parser.add_argument("--no-reload", action="store_true", help="Do not reload the config file while running")
+    parser.add_argument("--duration", type=float, help="Stop after this many seconds")
+    parser.add_argument("--quiet", action="store_true", help="Do not print each scan")
+    parser.add_argument("--log-level", default="WARNING", help="Logging level, e.g. INFO")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    runner = AcquisitionRunner(
+        args.config, output_dir=args.output_dir,
+        reload_interval=None if args.no_reload else args.reload_interval, display=not args.quiet,
+    )
+    try:
+        runner.start()
+    except Exception as e:  # Config errors, or the driver's Exception when the device cannot be set up
+        runner.close()
+        parser.exit(2, f"{e}\n")
+
+    try:
+        print("Starting data acquisition... Press Ctrl+C to stop.")
+        runner.run(duration=args.duration)
+    except KeyboardInterrupt:
+        print("Data acquisition stopped.")
+    print(f"Scheduler stats: {runner.scheduler.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
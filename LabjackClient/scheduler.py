@@ -0,0 +1,161 @@
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def parse_frequency(frequency):
+    """
+    Convert a frequency such as "5Hz", "2.5 kHz" or 10 to a rate in Hz.
+    """
+    if isinstance(frequency, (int, float)):
+        return float(frequency)
+    text = str(frequency).strip().lower().replace(" ", "")
+    multiplier = 1.0
+    if text.endswith("khz"):
+        text, multiplier = text[:-3], 1000.0
+    elif text.endswith("hz"):
+        text = text[:-2]
+    return float(text) * multiplier
+
+
+class FixedRateScheduler:
+    """
+    Call a read function (normally LabJackT7Driver.read_samples) on absolute monotonic
+    deadlines, so time spent reading and handling samples does not accumulate into drift.
+
+    When a call overruns its period, the missed-deadline policy decides what happens:
+      - "skip": drop the missed deadlines and resume on the next one in the future.
+      - "catch_up": fire immediately for every missed deadline until back on schedule.
+
+    :param read_func: Callable returning one sample (e.g. driver.read_samples)
+    :param rate_hz: Target rate in Hz, or a string such as "5Hz"
+    :param on_sample: Optional callable receiving (sample, scheduled_time) after each read
+    :param policy: "skip" (default) or "catch_up"
+    """
+
+    policies = ("skip", "catch_up")
+
+    def __init__(self, read_func, rate_hz, on_sample=None, policy="skip"):
+        if policy not in self.policies:
+            raise ValueError(f"Invalid missed-deadline policy: {policy}. Use 'skip' or 'catch_up'.")
+        self.read_func = read_func
+        self.set_rate(rate_hz)
+        self.on_sample = on_sample
+        self.policy = policy
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.reset_stats()
+
+    def set_rate(self, rate_hz):
+        """
+        Change the target rate. A running loop switches to the new period from its next deadline.
+        """
+        rate_hz = parse_frequency(rate_hz)
+        if rate_hz <= 0:
+            raise ValueError("Rate must be positive.")
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+
+    def reset_stats(self):
+        self.iterations = 0
+        self.overruns = 0  # Calls that finished after the next deadline
+        self.skipped_deadlines = 0  # Deadlines dropped under the "skip" policy
+        self.max_lateness = 0.0
+        self._lateness_mean = 0.0
+        self._lateness_m2 = 0.0
+        self._first_start = None
+        self._last_start = None
+
+    def _record(self, lateness, started):
+        # Welford's running mean/variance keeps jitter tracking O(1) per call
+        self.iterations += 1
+        delta = lateness - self._lateness_mean
+        self._lateness_mean += delta / self.iterations
+        self._lateness_m2 += delta * (lateness - self._lateness_mean)
+        self.max_lateness = max(self.max_lateness, lateness)
+        if self._first_start is None:
+            self._first_start = started
+        self._last_start = started
+
+    def get_stats(self):
+        """
+        Return achieved rate, jitter (standard deviation of start lateness), mean and max
+        lateness in seconds, and overrun/skip counts.
+        """
+        achieved_rate = None
+        if self.iterations > 1 and self._last_start > self._first_start:
+            achieved_rate = (self.iterations - 1) / (self._last_start - self._first_start)
+        jitter = math.sqrt(self._lateness_m2 / self.iterations) if self.iterations else 0.0
+        return {
+            "target_rate": self.rate_hz,
+            "achieved_rate": achieved_rate,
+            "iterations": self.iterations,
+            "jitter": jitter,
+            "mean_lateness": self._lateness_mean,
+            "max_lateness": self.max_lateness,
+            "overruns": self.overruns,
+            "skipped_deadlines": self.skipped_deadlines,
+            "policy": self.policy,
+        }
+
+    def run(self, max_iterations=None, duration=None):
+        """
+        Run the acquisition loop in the calling thread until stop() is called, or until
+        max_iterations calls or duration seconds have elapsed.
+        """
+        self._stop_event.clear()
+        start = time.monotonic()
+        end = start + duration if duration is not None else None
+        tick = 0
+        period = self.period
+        while not self._stop_event.is_set():
+            if max_iterations is not None and self.iterations >= max_iterations:
+                break
+            if self.period != period:
+                # Rate changed: rebase the schedule on the next deadline of the old period
+                start, tick, period = start + tick * period, 0, self.period
+            deadline = start + tick * period
+            if end is not None and deadline >= end:
+                break
+
+            delay = deadline - time.monotonic()
+            if delay > 0 and self._stop_event.wait(delay):
+                break
+
+            started = time.monotonic()
+            self._record(started - deadline, started)
+            sample = self.read_func()
+            if self.on_sample is not None:
+                self.on_sample(sample, deadline)
+
+            tick += 1
+            now = time.monotonic()
+            next_deadline = start + tick * period
+            if now > next_deadline:
+                self.overruns += 1
+                if self.policy == "skip":
+                    missed = int((now - next_deadline) // period) + 1
+                    self.skipped_deadlines += missed
+                    tick += missed
+
+    def start(self, max_iterations=None, duration=None):
+        """
+        Run the acquisition loop on a background thread.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("Scheduler is already running.")
+        self._thread = threading.Thread(
+            target=self.run, kwargs={"max_iterations": max_iterations, "duration": duration},
+            name="FixedRateScheduler", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+        logger.info("Scheduler stopped: %s", self.get_stats())
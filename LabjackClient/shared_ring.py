@@ -0,0 +1,223 @@
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .ring_buffer import ScanRingBuffer
+
+_MAGIC = 0x4C4A52494E47  # "LJRING"
+_VERSION = 1
+
+# Slots of the int64 header at the start of the shared memory block
+_HEADER_MAGIC, _HEADER_VERSION, _HEADER_CAPACITY, _HEADER_CHANNELS, _HEADER_BEGIN, _HEADER_END, _HEADER_CLOSED = range(7)
+_HEADER_SLOTS = 8
+
+# Held while _attach() swaps out the process-wide resource_tracker.register, and while a
+# publisher creates its block, so a publisher created on another thread is still tracked
+_tracker_lock = threading.Lock()
+
+
+def _layout(buffer, capacity, num_channels):
+    """
+    Map the header, timestamps and (channels x 2*capacity) data arrays onto a shared memory buffer.
+    """
+    header = np.ndarray((_HEADER_SLOTS,), dtype=np.int64, buffer=buffer)
+    offset = header.nbytes
+    timestamps = np.ndarray((2 * capacity,), dtype=np.float64, buffer=buffer, offset=offset)
+    offset += timestamps.nbytes
+    data = np.ndarray((num_channels, 2 * capacity), dtype=np.float64, buffer=buffer, offset=offset)
+    return header, timestamps, data
+
+
+def _attach(name):
+    """
+    Open an existing shared memory block without registering it with this process's
+    resource tracker, which would otherwise remove the block when a subscriber exits
+    (Python < 3.13 has no track=False); only the publisher may remove it.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    with _tracker_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedScanPublisher(ScanRingBuffer):
+    """
+    ScanRingBuffer in a multiprocessing.shared_memory block, so other processes on the
+    host can read the scans of one acquisition with SharedScanSubscriber instead of
+    opening their own connection to the device.
+
+    The block holds an int64 header followed by the same mirrored timestamp and data
+    arrays as ScanRingBuffer. Two sequence numbers in the header implement the protocol:
+    before a block of n scans is stored, `begin` is advanced to the sequence the write
+    will end at; once the scans are stored, `end` (total_written) is advanced to match.
+    A reader holding data from sequence s knows it is intact as long as
+    begin - capacity <= s, which it can check after using the data.
+
+    There must be a single publisher per block. The publisher owns the block and
+    removes it on close().
+
+    :param capacity: Number of scans kept per channel
+    :param num_channels: Number of channel rows
+    :param name: Shared memory name; None picks a unique name (see the name attribute)
+    """
+
+    def __init__(self, capacity, num_channels, name=None):
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive.")
+        size = _HEADER_SLOTS * 8 + 2 * int(capacity) * (int(num_channels) + 1) * 8
+        with _tracker_lock:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self._header, timestamps, data = _layout(self._shm.buf, int(capacity), int(num_channels))
+        self._header[:] = 0
+        self._header[_HEADER_CAPACITY] = capacity
+        self._header[_HEADER_CHANNELS] = num_channels
+        timestamps[:] = np.nan
+        data[:] = np.nan
+        self._setup(timestamps, data)  # Use the shared arrays directly; no private copy is allocated
+        self._header[_HEADER_VERSION] = _VERSION
+        self._header[_HEADER_MAGIC] = _MAGIC  # Written last: subscribers may attach from here on
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def total_written(self):
+        return int(self._header[_HEADER_END])
+
+    @total_written.setter
+    def total_written(self, value):
+        self._header[_HEADER_END] = value
+
+    def write(self, timestamps, values, scaling_factors=None, rows=None):
+        with self._lock:
+            # Mark the slots about to be overwritten before touching them
+            self._header[_HEADER_BEGIN] = self.total_written + len(timestamps)
+        super().write(timestamps, values, scaling_factors, rows)
+
+    def close(self):
+        """
+        Mark the ring closed for subscribers, then release and remove the shared memory block.
+        Waits for a write in progress; the publisher must not be written to afterwards.
+        """
+        with self._lock:
+            self._header[_HEADER_CLOSED] = 1
+            self._header = self.timestamps = self.data = None
+        self._shm.close()
+        self._shm.unlink()
+
+
+class SharedScanSubscriber:
+    """
+    Read-only view of a SharedScanPublisher's ring from any process on the same host.
+
+    latest() returns zero-copy views straight into shared memory; since the publisher
+    keeps writing, check is_valid() with the returned sequence after using them.
+    read_since() returns copies that are checked against the sequence numbers, so any
+    scans overwritten while copying are dropped and reported as lost.
+
+    :param name: Shared memory name of the publisher
+    :param poll_interval: Seconds between checks for new scans while read_since() waits
+    """
+
+    def __init__(self, name, poll_interval=0.001):
+        self._shm = _attach(name)
+        header = np.ndarray((_HEADER_SLOTS,), dtype=np.int64, buffer=self._shm.buf)
+        if header[_HEADER_MAGIC] != _MAGIC or header[_HEADER_VERSION] != _VERSION:
+            del header
+            self._shm.close()
+            raise ValueError(f"Shared memory block {name} is not a LabJack scan ring")
+        self.name = name
+        self.capacity = int(header[_HEADER_CAPACITY])
+        self.num_channels = int(header[_HEADER_CHANNELS])
+        self.poll_interval = poll_interval
+        self._header, self.timestamps, self.data = _layout(self._shm.buf, self.capacity, self.num_channels)
+        self.timestamps.flags.writeable = False
+        self.data.flags.writeable = False
+
+    @property
+    def total_written(self):
+        return int(self._header[_HEADER_END])
+
+    @property
+    def closed(self):
+        """
+        True once the publisher has closed the ring; no more scans will arrive.
+        """
+        return bool(self._header[_HEADER_CLOSED])
+
+    def __len__(self):
+        return min(self.total_written, self.capacity)
+
+    def _window(self, cursor, count):
+        start = cursor % self.capacity
+        return self.timestamps[start:start + count], self.data[:, start:start + count]
+
+    def is_valid(self, sequence):
+        """
+        True if the scans from sequence onwards have not been overwritten by the publisher.
+        """
+        return int(self._header[_HEADER_BEGIN]) - self.capacity <= sequence
+
+    def latest(self, n=None):
+        """
+        Return zero-copy, read-only views of the newest n scans (default: all buffered).
+
+        :return: Tuple of (timestamps, data, sequence) with shapes (n,) and (channels, n);
+            sequence is the sequence number of the first scan, for is_valid()
+        """
+        total = self.total_written
+        available = min(total, self.capacity)
+        n = available if n is None else min(int(n), available)
+        timestamps, data = self._window(total - n, n)
+        return timestamps, data, total - n
+
+    def read_since(self, cursor, timeout=None, max_samples=None):
+        """
+        Return copies of the scans published after cursor, polling up to timeout seconds
+        until at least one is available. Scans the publisher overwrote before they could
+        be copied are skipped and counted as lost.
+
+        :param cursor: Sequence number the caller has consumed up to (0 initially)
+        :param timeout: Seconds to wait for new scans; None waits until one arrives or the ring closes
+        :param max_samples: Upper bound on the number of scans returned
+        :return: Tuple of (timestamps, data, next_cursor, lost)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.total_written <= cursor and not self.closed:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(self.poll_interval)
+
+        total = self.total_written
+        oldest = max(0, total - self.capacity)
+        lost = max(0, oldest - cursor)
+        cursor = max(cursor, oldest)
+        count = total - cursor
+        if max_samples is not None:
+            count = min(count, int(max_samples))
+        timestamps, data = self._window(cursor, count)
+        timestamps, data = timestamps.copy(), data.copy()
+
+        # Drop whatever the publisher started overwriting while we were copying
+        overwritten = min(count, max(0, int(self._header[_HEADER_BEGIN]) - self.capacity - cursor))
+        if overwritten:
+            timestamps, data = timestamps[overwritten:], data[:, overwritten:]
+            lost += overwritten
+        return timestamps, data, cursor + count, lost
+
+    def close(self):
+        """
+        Detach from the shared memory block. Views returned by latest() must be released first.
+        """
+        self._header = self.timestamps = self.data = None
+        self._shm.close()
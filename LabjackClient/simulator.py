@@ -0,0 +1,363 @@
+import math
+import random
+import re
+import threading
+import time
+
+from labjack import ljm
+
+
+# T7 Modbus map for the registers the driver uses: name suffix -> (base address, step per channel, data type)
+_CHANNEL_REGISTERS = {
+    "": (0, 2, ljm.constants.FLOAT32),
+    "_EF_READ_A": (7000, 2, ljm.constants.FLOAT32),
+    "_EF_INDEX": (9000, 2, ljm.constants.UINT32),
+    "_EF_CONFIG_A": (9300, 2, ljm.constants.UINT32),
+    "_EF_CONFIG_B": (9600, 2, ljm.constants.UINT32),
+    "_RANGE": (40000, 2, ljm.constants.FLOAT32),
+    "_NEGATIVE_CH": (41000, 1, ljm.constants.UINT16),
+    "_RESOLUTION_INDEX": (41500, 1, ljm.constants.UINT16),
+}
+_GLOBAL_REGISTERS = {
+    "STREAM_SETTLING_US": (4008, ljm.constants.FLOAT32),
+    "STREAM_RESOLUTION_INDEX": (4010, ljm.constants.UINT32),
+    "STREAM_CLOCK_SOURCE": (4014, ljm.constants.UINT32),
+    "STREAM_TRIGGER_INDEX": (4024, ljm.constants.UINT32),
+}
+_CHANNEL_NAME_PATTERN = re.compile(r"^AIN(\d+)(.*)$")
+
+FLEXRMS_EF_INDEX = 10
+GND = 199
+
+# Error code the simulator uses for the device-side FlexRMS "no period found" error.
+# The driver identifies this error by its name, so only the string matters.
+AIN_EF_COULD_NOT_FIND_PERIOD = 2706
+
+
+class Waveform:
+    """
+    Synthetic signal on one analog input: dc + amplitude * sin(2*pi*frequency*t + phase) + noise.
+    """
+
+    def __init__(self, dc=0.0, amplitude=0.0, frequency=60.0, phase=0.0, noise=0.0):
+        self.dc = dc
+        self.amplitude = amplitude
+        self.frequency = frequency
+        self.phase = phase
+        self.noise = noise
+
+    def value(self, t):
+        value = self.dc + self.amplitude * math.sin(2 * math.pi * self.frequency * t + self.phase)
+        if self.noise:
+            value += random.gauss(0.0, self.noise)
+        return value
+
+    def rms(self):
+        return math.sqrt(self.dc ** 2 + self.amplitude ** 2 / 2 + self.noise ** 2)
+
+
+class SimulatedLJM:
+    """
+    In-process stand-in for the labjack.ljm module, for testing and benchmarking the driver
+    without hardware. Pass an instance as the driver's backend:
+
+        sim = SimulatedLJM(latency=0.002)
+        sim.set_waveform(0, amplitude=1.0, frequency=60)
+        driver = LabJackT7Driver(backend=sim)
+
+    Every call that would be a network round trip sleeps for latency (+/- latency_jitter)
+    seconds outside the simulator's lock, so concurrent calls overlap as they would on a
+    real network. Reading AIN#_EF_READ_A on a FlexRMS channel additionally blocks for the
+    configured scan time, like the device does.
+
+    Errors can be injected per register with inject_error(), and disconnect() makes every
+    call fail until reconnect() (or until the given duration has passed).
+    """
+
+    LJMError = ljm.LJMError
+    constants = ljm.constants
+    errorcodes = ljm.errorcodes
+
+    def __init__(self, latency=0.0, latency_jitter=0.0, serial_number=470000000, flexrms_blocking=True):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.serial_number = serial_number
+        self.flexrms_blocking = flexrms_blocking
+        self.waveforms = {}  # Channel -> Waveform
+        self.registers = {}  # Address -> value written by the host
+        self.call_counts = {}  # ljm function name -> number of calls
+        self._injected_errors = {}  # Address -> [error code, error string, remaining count]
+        self._disconnected_until = None
+        self._handles = {}
+        self._next_handle = 1
+        self._streams = {}
+        self._epoch = time.monotonic()
+        self._lock = threading.Lock()
+
+        self._names = {}
+        self._addresses = {}
+        for channel in range(16):
+            for suffix, (base, step, data_type) in _CHANNEL_REGISTERS.items():
+                self._register(f"AIN{channel}{suffix}", base + step * channel, data_type)
+        for name, (address, data_type) in _GLOBAL_REGISTERS.items():
+            self._register(name, address, data_type)
+
+    def _register(self, name, address, data_type):
+        self._names[name] = (address, data_type)
+        self._addresses[address] = name
+
+    # Simulation controls
+
+    def set_waveform(self, channel, dc=0.0, amplitude=0.0, frequency=60.0, phase=0.0, noise=0.0):
+        self.waveforms[channel] = Waveform(dc, amplitude, frequency, phase, noise)
+
+    def inject_error(self, name, error_string="AIN_EF_COULD_NOT_FIND_PERIOD", count=1,
+                     error_code=AIN_EF_COULD_NOT_FIND_PERIOD):
+        """
+        Make the next count accesses to a register (name or address) raise LJMError.
+        Use count=None for a persistent error.
+        """
+        address = name if isinstance(name, int) else self._names[name][0]
+        with self._lock:
+            self._injected_errors[address] = [error_code, error_string, count]
+
+    def clear_errors(self):
+        with self._lock:
+            self._injected_errors.clear()
+
+    def disconnect(self, duration=None):
+        """
+        Simulate a lost connection: every call fails until reconnect() or until duration seconds pass.
+        """
+        with self._lock:
+            self._disconnected_until = math.inf if duration is None else time.monotonic() + duration
+
+    def reconnect(self):
+        with self._lock:
+            self._disconnected_until = None
+
+    @property
+    def connected(self):
+        return self._disconnected_until is None or time.monotonic() >= self._disconnected_until
+
+    # Internals
+
+    def _round_trip(self, function, handle=None):
+        with self._lock:
+            self.call_counts[function] = self.call_counts.get(function, 0) + 1
+        delay = self.latency
+        if self.latency_jitter:
+            delay = max(0.0, delay + random.uniform(-self.latency_jitter, self.latency_jitter))
+        if delay:
+            time.sleep(delay)
+        if not self.connected:
+            raise ljm.LJMError(ljm.errorcodes.DEVICE_DISCONNECTED, errorString="DEVICE_DISCONNECTED")
+        if handle is not None and handle not in self._handles:
+            raise ljm.LJMError(ljm.errorcodes.DEVICE_NOT_OPEN, errorString="DEVICE_NOT_OPEN")
+
+    def _check_injected(self, address):
+        with self._lock:
+            error = self._injected_errors.get(address)
+            if error is None:
+                return
+            code, error_string, remaining = error
+            if remaining is not None:
+                if remaining <= 1:
+                    del self._injected_errors[address]
+                else:
+                    error[2] = remaining - 1
+        raise ljm.LJMError(code, address, error_string)
+
+    def _resolve(self, name):
+        if name not in self._names:
+            raise ljm.LJMError(ljm.errorcodes.INVALID_NAME, errorString=f"INVALID_NAME {name}")
+        return self._names[name]
+
+    def _channel_register(self, address):
+        match = _CHANNEL_NAME_PATTERN.match(self._addresses.get(address, ""))
+        if not match:
+            return None, None
+        return int(match.group(1)), match.group(2)
+
+    def _now(self):
+        return time.monotonic() - self._epoch
+
+    def _input_voltage(self, channel, t):
+        waveform = self.waveforms.get(channel)
+        value = waveform.value(t) if waveform else 0.0
+        negative = int(self.registers.get(self._names[f"AIN{channel}_NEGATIVE_CH"][0], GND))
+        if negative != GND:
+            other = self.waveforms.get(negative)
+            value -= other.value(t) if other else 0.0
+        voltage_range = self.registers.get(self._names[f"AIN{channel}_RANGE"][0], 10.0) or 10.0
+        return max(-voltage_range, min(voltage_range, value))
+
+    def _flexrms(self, channel, address):
+        ef_index = self.registers.get(self._names[f"AIN{channel}_EF_INDEX"][0], 0)
+        if ef_index != FLEXRMS_EF_INDEX:
+            return 0.0
+        scan_time = self.registers.get(self._names[f"AIN{channel}_EF_CONFIG_B"][0], 10000) / 1e6
+        if self.flexrms_blocking and scan_time:
+            time.sleep(scan_time)
+
+        waveform = self.waveforms.get(channel)
+        negative = int(self.registers.get(self._names[f"AIN{channel}_NEGATIVE_CH"][0], GND))
+        other = self.waveforms.get(negative) if negative != GND else None
+        ac = [w for w in (waveform, other) if w is not None and w.amplitude]
+        if not ac or any(scan_time * w.frequency < 1 for w in ac):
+            # No full AC period inside the scan window
+            raise ljm.LJMError(AIN_EF_COULD_NOT_FIND_PERIOD, address, "AIN_EF_COULD_NOT_FIND_PERIOD")
+        if other is None:
+            return waveform.rms()
+        # RMS of the difference of two sines at the same frequency
+        dc = (waveform.dc if waveform else 0.0) - other.dc
+        a1 = waveform.amplitude if waveform else 0.0
+        phase = (waveform.phase if waveform else 0.0) - other.phase
+        amplitude_squared = a1 ** 2 + other.amplitude ** 2 - 2 * a1 * other.amplitude * math.cos(phase)
+        return math.sqrt(dc ** 2 + amplitude_squared / 2)
+
+    def _read_address(self, address):
+        self._check_injected(address)
+        channel, suffix = self._channel_register(address)
+        if channel is not None and suffix == "":
+            return self._input_voltage(channel, self._now())
+        if channel is not None and suffix == "_EF_READ_A":
+            return self._flexrms(channel, address)
+        if address not in self._addresses:
+            raise ljm.LJMError(ljm.errorcodes.INVALID_ADDRESS, address, "INVALID_ADDRESS")
+        return self.registers.get(address, 0.0)
+
+    def _write_address(self, address, value):
+        self._check_injected(address)
+        if address not in self._addresses:
+            raise ljm.LJMError(ljm.errorcodes.INVALID_ADDRESS, address, "INVALID_ADDRESS")
+        channel, suffix = self._channel_register(address)
+        with self._lock:
+            if suffix == "_EF_INDEX":
+                # Writing EF_INDEX resets the feature's config registers
+                for config in ("_EF_CONFIG_A", "_EF_CONFIG_B"):
+                    self.registers.pop(self._names[f"AIN{channel}{config}"][0], None)
+            self.registers[address] = value
+
+    # ljm API
+
+    def openS(self, deviceType="ANY", connectionType="ANY", identifier="ANY"):
+        self._round_trip("openS")
+        with self._lock:
+            handle = self._next_handle
+            self._next_handle += 1
+            self._handles[handle] = (deviceType, connectionType, identifier)
+        return handle
+
+    def getHandleInfo(self, handle):
+        self._round_trip("getHandleInfo", handle)
+        return (ljm.constants.dtT7, ljm.constants.ctETHERNET, self.serial_number, 0, 502, 1040)
+
+    def close(self, handle):
+        with self._lock:
+            self._handles.pop(handle, None)
+            self._streams.pop(handle, None)
+
+    def namesToAddresses(self, numFrames, aNames, aAddresses=None, aDataTypes=None):
+        resolved = [self._resolve(name) for name in aNames[:numFrames]]
+        return [address for address, _ in resolved], [data_type for _, data_type in resolved]
+
+    def nameToAddress(self, name):
+        return self._resolve(name)
+
+    def eReadAddress(self, handle, address, dataType):
+        self._round_trip("eReadAddress", handle)
+        return self._read_address(address)
+
+    def eReadAddresses(self, handle, numFrames, aAddresses, aDataTypes):
+        self._round_trip("eReadAddresses", handle)
+        return [self._read_address(address) for address in aAddresses[:numFrames]]
+
+    def eReadName(self, handle, name):
+        self._round_trip("eReadName", handle)
+        return self._read_address(self._resolve(name)[0])
+
+    def eReadNames(self, handle, numFrames, aNames):
+        self._round_trip("eReadNames", handle)
+        return [self._read_address(self._resolve(name)[0]) for name in aNames[:numFrames]]
+
+    def eWriteAddress(self, handle, address, dataType, value):
+        self._round_trip("eWriteAddress", handle)
+        self._write_address(address, value)
+
+    def eWriteAddresses(self, handle, numFrames, aAddresses, aDataTypes, aValues):
+        self._round_trip("eWriteAddresses", handle)
+        for address, value in zip(aAddresses[:numFrames], aValues):
+            self._write_address(address, value)
+
+    def eWriteName(self, handle, name, value):
+        self._round_trip("eWriteName", handle)
+        self._write_address(self._resolve(name)[0], value)
+
+    def eWriteNames(self, handle, numFrames, aNames, aValues):
+        self._round_trip("eWriteNames", handle)
+        for name, value in zip(aNames[:numFrames], aValues):
+            self._write_address(self._resolve(name)[0], value)
+
+    def eStreamStart(self, handle, scansPerRead, numAddresses, aScanList, scanRate):
+        self._round_trip("eStreamStart", handle)
+        with self._lock:
+            if handle in self._streams:
+                raise ljm.LJMError(ljm.errorcodes.COULD_NOT_START_STREAM, errorString="STREAM_IS_ACTIVE")
+            self._streams[handle] = {
+                "scans_per_read": scansPerRead,
+                "scan_list": list(aScanList[:numAddresses]),
+                "scan_rate": float(scanRate),
+                "started": time.monotonic(),
+                "scans_returned": 0,
+                "skipped_scans": 0,
+            }
+        return float(scanRate)
+
+    def skip_stream_scans(self, handle, count):
+        """
+        Mark the next count scans of a running stream as skipped (returned as -9999).
+        """
+        with self._lock:
+            self._streams[handle]["skipped_scans"] += count
+
+    def eStreamRead(self, handle):
+        with self._lock:
+            stream = self._streams.get(handle)
+        if stream is None:
+            raise ljm.LJMError(ljm.errorcodes.STREAM_NOT_RUNNING, errorString="STREAM_NOT_RUNNING")
+
+        scans_per_read = stream["scans_per_read"]
+        scan_rate = stream["scan_rate"]
+        first_scan = stream["scans_returned"]
+        ready_at = stream["started"] + (first_scan + scans_per_read) / scan_rate
+        delay = ready_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        if not self.connected:
+            raise ljm.LJMError(ljm.errorcodes.DEVICE_DISCONNECTED, errorString="DEVICE_DISCONNECTED")
+        with self._lock:
+            if self._streams.get(handle) is not stream:
+                raise ljm.LJMError(ljm.errorcodes.STREAM_NOT_RUNNING, errorString="STREAM_NOT_RUNNING")
+
+        offset = stream["started"] - self._epoch
+        data = []
+        for scan in range(first_scan, first_scan + scans_per_read):
+            t = offset + scan / scan_rate
+            skipped = stream["skipped_scans"] > 0
+            if skipped:
+                stream["skipped_scans"] -= 1
+            for address in stream["scan_list"]:
+                channel, _ = self._channel_register(address)
+                data.append(ljm.constants.DUMMY_VALUE if skipped else self._input_voltage(channel, t))
+        stream["scans_returned"] += scans_per_read
+
+        available = int((time.monotonic() - stream["started"]) * scan_rate)
+        ljm_backlog = max(0, available - stream["scans_returned"])
+        return data, 0, ljm_backlog
+
+    def eStreamStop(self, handle):
+        self._round_trip("eStreamStop", handle)
+        with self._lock:
+            if self._streams.pop(handle, None) is None:
+                raise ljm.LJMError(ljm.errorcodes.STREAM_NOT_RUNNING, errorString="STREAM_NOT_RUNNING")
@@ -0,0 +1,270 @@
+import csv
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# pyarrow is only needed for the columnar writers and is slow to import, so it is
+# loaded by the first ParquetSink rather than with the package
+pa = None
+pq = None
+
+
+def _import_pyarrow():
+    global pa, pq
+    if pa is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("pyarrow is required for ParquetSink. Install it with: pip install pyarrow")
+        pa, pq = pyarrow, pyarrow.parquet
+
+
+class BackgroundSink:
+    """
+    Base class for output sinks that write batches of scans on a background thread.
+
+    Scans are collected into batches of batch_size rows (see write()); full batches are
+    handed to a bounded queue and written by a worker thread, so a slow disk never blocks
+    acquisition. If the queue is full the batch is dropped and counted in get_stats().
+
+    Output files rotate once they exceed rotate_bytes or have been open for rotate_seconds,
+    and whenever the columns of a batch differ from those of the current file (e.g. a
+    channel added or renamed by a config reload), so every file has a single header.
+    Rotated files are named <stem>_<index><suffix>, e.g. run_0001.csv.
+
+    :param path: Output file path; the index is inserted before the extension
+    :param batch_size: Rows per batch handed to the writer thread
+    :param max_queued_batches: Queue bound; further batches are dropped while it is full
+    :param rotate_bytes: Rotate to a new file after this many bytes (None: never)
+    :param rotate_seconds: Rotate to a new file after this many seconds (None: never)
+    """
+
+    def __init__(self, path, batch_size=1000, max_queued_batches=64, rotate_bytes=None, rotate_seconds=None):
+        self.path = path
+        self.batch_size = batch_size
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.columns = None  # Column names of the current file
+        self.files = []  # Paths of all files written so far
+        self._pending = []
+        self._queue = queue.Queue(maxsize=max_queued_batches)
+        self._stats_lock = threading.Lock()
+        self._stats = {"written_rows": 0, "written_batches": 0, "dropped_batches": 0, "dropped_rows": 0, "errors": 0}
+        self._file_index = 0
+        self._file_opened = None
+        self._thread = threading.Thread(target=self._run, name=f"{type(self).__name__}Writer", daemon=True)
+        self._thread.start()
+
+    def write(self, scan):
+        """
+        Add one scan (a dict such as the output of read_samples(), plus any timestamp
+        columns) to the current batch, submitting the batch once it is full.
+        """
+        self._pending.append(scan)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def write_batch(self, columns):
+        """
+        Submit a ready-made columnar batch: a dict mapping column name to a sequence of values.
+
+        :return: True if the batch was queued, False if it was dropped
+        """
+        try:
+            self._queue.put_nowait(columns)
+            return True
+        except queue.Full:
+            rows = len(next(iter(columns.values()), ()))
+            with self._stats_lock:
+                self._stats["dropped_batches"] += 1
+                self._stats["dropped_rows"] += rows
+            logger.warning("%s queue full, dropped a batch of %s rows", type(self).__name__, rows)
+            return False
+
+    def flush(self):
+        """
+        Submit the partially filled batch, if any.
+        """
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        self.write_batch({column: [row.get(column) for row in rows] for column in columns})
+
+    def close(self):
+        """
+        Flush pending scans, wait for the queue to drain and close the current file.
+        """
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["files"] = len(self.files)
+        return stats
+
+    def _run(self):
+        while True:
+            columns = self._queue.get()
+            if columns is None:
+                break
+            try:
+                if list(columns) != self.columns:
+                    if self.columns is not None:
+                        logger.info("%s columns changed to %s", type(self).__name__, list(columns))
+                    self.columns = list(columns)
+                    self._rotate()
+                elif self._should_rotate():
+                    self._rotate()
+                self._write_columns(columns)
+                with self._stats_lock:
+                    self._stats["written_rows"] += len(next(iter(columns.values()), ()))
+                    self._stats["written_batches"] += 1
+            except Exception as e:
+                with self._stats_lock:
+                    self._stats["errors"] += 1
+                logger.error("%s failed to write batch: %s", type(self).__name__, e)
+        if self._file_opened is not None:
+            self._close_file()
+
+    def _should_rotate(self):
+        if self.rotate_seconds is not None and time.monotonic() - self._file_opened >= self.rotate_seconds:
+            return True
+        return self.rotate_bytes is not None and self._file_size() >= self.rotate_bytes
+
+    def _rotate(self):
+        if self._file_opened is not None:
+            self._close_file()
+        stem, suffix = os.path.splitext(self.path)
+        path = f"{stem}_{self._file_index:04d}{suffix}"
+        self._file_index += 1
+        self._open_file(path)
+        self._file_opened = time.monotonic()
+        self.files.append(path)
+        logger.info("%s writing to %s", type(self).__name__, path)
+
+    def _open_file(self, path):
+        raise NotImplementedError
+
+    def _write_columns(self, columns):
+        raise NotImplementedError
+
+    def _file_size(self):
+        raise NotImplementedError
+
+    def _close_file(self):
+        raise NotImplementedError
+
+
+class CSVSink(BackgroundSink):
+    """
+    Buffered CSV writer. Each file starts with a header row of the column names.
+
+    :param buffer_size: Size in bytes of the file write buffer
+    """
+
+    def __init__(self, path, buffer_size=1 << 20, **kwargs):
+        self.buffer_size = buffer_size
+        self._file = None
+        self._writer = None
+        super().__init__(path, **kwargs)
+
+    def _open_file(self, path):
+        self._file = open(path, "w", newline="", buffering=self.buffer_size)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def _write_columns(self, columns):
+        self._writer.writerows(zip(*(columns.get(column, ()) for column in self.columns)))
+
+    def _file_size(self):
+        return self._file.tell()
+
+    def _close_file(self):
+        self._file.close()
+
+
+class ParquetSink(BackgroundSink):
+    """
+    Columnar writer using pyarrow. Each batch becomes one row group.
+
+    :param file_format: "parquet" (default) or "arrow" for the Arrow IPC file format
+    :param compression: Parquet compression codec
+    """
+
+    def __init__(self, path, file_format="parquet", compression="snappy", **kwargs):
+        _import_pyarrow()
+        if file_format not in ("parquet", "arrow"):
+            raise ValueError(f"Invalid file format: {file_format}. Use 'parquet' or 'arrow'.")
+        self.file_format = file_format
+        self.compression = compression
+        self._sink = None
+        self._writer = None
+        self._schema = None
+        super().__init__(path, **kwargs)
+
+    def _open_file(self, path):
+        self._sink = pa.OSFile(path, "wb")
+        if self._schema is not None and self._schema.names != self.columns:
+            self._schema = None  # Columns changed: infer the schema again from the next batch
+        self._writer = None  # Created with the first batch, once the schema is known
+
+    def _write_columns(self, columns):
+        table = pa.Table.from_pydict({column: columns.get(column, []) for column in self.columns})
+        if self._schema is None:
+            self._schema = table.schema
+        else:
+            table = table.cast(self._schema)
+        if self._writer is None:
+            if self.file_format == "parquet":
+                self._writer = pq.ParquetWriter(self._sink, self._schema, compression=self.compression)
+            else:
+                self._writer = pa.ipc.new_file(self._sink, self._schema)
+        if self.file_format == "parquet":
+            self._writer.write_table(table, row_group_size=table.num_rows)
+        else:
+            self._writer.write_table(table)
+
+    def _file_size(self):
+        return self._sink.tell()
+
+    def _close_file(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._sink.close()
+
+
+def build_sinks(output_config, base_path):
+    """
+    Create sinks from the `output` section of the YAML config, e.g.
+
+        output:
+          CSV: {batch_size: 500, rotate_seconds: 3600}
+          Parquet: {rotate_bytes: 100000000}
+
+    Each entry's options are passed to the sink's constructor. Unsupported outputs are
+    skipped with a warning.
+
+    :param base_path: Output path without extension, e.g. "data/LabJackTest"
+    :return: List of sinks
+    """
+    sinks = []
+    for name, options in (output_config or {}).items():
+        options = dict(options or {})
+        key = name.lower()
+        if key == "csv":
+            sinks.append(CSVSink(options.pop("path", f"{base_path}.csv"), **options))
+        elif key in ("parquet", "arrow"):
+            extension = ".parquet" if key == "parquet" else ".arrow"
+            sinks.append(ParquetSink(options.pop("path", f"{base_path}{extension}"), file_format=key, **options))
+        else:
+            logger.warning("Output '%s' is not supported by LabjackClient; skipping it.", name)
+    return sinks
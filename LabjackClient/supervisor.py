@@ -0,0 +1,152 @@
+import collections
+import logging
+import random
+import threading
+import time
+
+from labjack import ljm
+
+logger = logging.getLogger(__name__)
+
+# LJM errors that mean the connection to the device is gone, as opposed to errors in a
+# request (invalid address, FlexRMS period, end of a replayed recording, ...)
+_CONNECTION_ERROR_NAMES = (
+    "DEVICE_NOT_OPEN", "INVALID_HANDLE", "DEVICE_DISCONNECTED", "DEVICE_NOT_FOUND", "CANNOT_CONNECT",
+    "SOCKET_LEVEL_ERROR", "CANNOT_OPEN_DEVICE", "RECONNECT_FAILED", "CONNECTION_HAS_YIELDED_RECONNECT_FAILED",
+    "USB_FAILURE", "NO_COMMAND_BYTES_SENT", "INCORRECT_NUM_COMMAND_BYTES_SENT", "NO_RESPONSE_BYTES_RECEIVED",
+    "INCORRECT_NUM_RESPONSE_BYTES_RECEIVED",
+)
+CONNECTION_ERROR_CODES = frozenset(
+    getattr(ljm.errorcodes, name) for name in _CONNECTION_ERROR_NAMES if hasattr(ljm.errorcodes, name)
+)
+
+
+def is_connection_error(error):
+    """
+    True if an LJMError means the connection was lost and reconnecting can help.
+    """
+    return getattr(error, "errorCode", None) in CONNECTION_ERROR_CODES
+
+
+class ConnectionSupervisor:
+    """
+    Reconnect a LabJackT7Driver in the background with exponential backoff.
+
+    When the driver reports a lost connection, acquisition keeps going: read_samples()
+    returns NaN-filled scans immediately instead of blocking, while this supervisor
+    reopens the device on its own thread and reapplies the cached channel config in one
+    batch (see LabJackT7Driver.start). A stream that was running is restarted with the
+    same parameters. Every outage is recorded as a (start, end) gap in wall-clock time.
+
+    :param driver: The LabJackT7Driver to supervise
+    :param initial_backoff: Seconds to wait before the first reconnect attempt
+    :param max_backoff: Upper bound on the wait between attempts
+    :param backoff_multiplier: Factor the wait grows by after each failed attempt
+    :param jitter: Random fraction (+/-) applied to each wait, so many devices do not retry in lockstep
+    :param max_gaps: Number of past gaps kept in memory
+    """
+
+    def __init__(self, driver, initial_backoff=0.1, max_backoff=30.0, backoff_multiplier=2.0, jitter=0.1,
+                 max_gaps=1000):
+        self.driver = driver
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.backoff_multiplier = backoff_multiplier
+        self.jitter = jitter
+        self.gaps = collections.deque(maxlen=max_gaps)  # Completed outages as (start, end) timestamps
+        self.reconnect_count = 0
+        self.failed_attempts = 0
+        self.missing_scans = 0  # Scans returned as NaN because they could not be read
+        self.total_downtime = 0.0
+        self.last_error = None
+        self._outage_start = None
+        self._outage_monotonic = None
+        self._resume_stream = False
+        self._lock = threading.Lock()
+        self._shutdown_event = threading.Event()
+        self._thread = None
+
+    @property
+    def connected(self):
+        return self._outage_start is None
+
+    def connection_lost(self, error, resume_stream=False):
+        """
+        Mark the connection as lost and start reconnecting in the background. Further calls
+        during the same outage only record the error.
+        """
+        with self._lock:
+            self.last_error = str(error)
+            self._resume_stream = self._resume_stream or resume_stream
+            if self._outage_start is not None or self._shutdown_event.is_set():
+                return
+            self._outage_start = time.time()
+            self._outage_monotonic = time.monotonic()
+            logger.error("LabJack connection lost: %s. Reconnecting in the background.", error)
+            self._thread = threading.Thread(target=self._reconnect_loop, name="LabJackReconnect", daemon=True)
+            self._thread.start()
+
+    def record_missing_scan(self):
+        with self._lock:
+            self.missing_scans += 1
+
+    def _reconnect_loop(self):
+        backoff = self.initial_backoff
+        while True:
+            delay = backoff * (1 + random.uniform(-self.jitter, self.jitter))
+            if self._shutdown_event.wait(max(0.0, delay)):
+                return
+            try:
+                self.driver._reopen()
+                if self._resume_stream:
+                    self.driver._resume_stream()
+            except Exception as e:
+                with self._lock:
+                    self.failed_attempts += 1
+                    self.last_error = str(e)
+                logger.warning("Reconnect attempt failed, retrying in up to %.1f s: %s", backoff * self.backoff_multiplier, e)
+                backoff = min(self.max_backoff, backoff * self.backoff_multiplier)
+                continue
+
+            with self._lock:
+                downtime = time.monotonic() - self._outage_monotonic
+                self.gaps.append((self._outage_start, time.time()))
+                self.total_downtime += downtime
+                self.reconnect_count += 1
+                self._resume_stream = False
+                self._outage_start = None
+                self._outage_monotonic = None
+            logger.info("LabJack reconnected after %.2f s", downtime)
+            return
+
+    def get_metrics(self):
+        """
+        Return reconnect count, failed attempts, missing scans, total and current downtime
+        in seconds, the number of recorded gaps and the last error.
+        """
+        with self._lock:
+            current = time.monotonic() - self._outage_monotonic if self._outage_monotonic is not None else 0.0
+            return {
+                "connected": self._outage_start is None,
+                "reconnect_count": self.reconnect_count,
+                "failed_attempts": self.failed_attempts,
+                "missing_scans": self.missing_scans,
+                "total_downtime": self.total_downtime + current,
+                "current_downtime": current,
+                "gaps": len(self.gaps),
+                "last_error": self.last_error,
+            }
+
+    def activate(self):
+        """
+        Allow reconnects again after shutdown(), e.g. when the driver is started again.
+        """
+        self._shutdown_event.clear()
+
+    def shutdown(self):
+        """
+        Stop any reconnect in progress.
+        """
+        self._shutdown_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
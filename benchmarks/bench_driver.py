@@ -0,0 +1,161 @@
+"""
+Benchmark LabJackT7Driver against the simulated ljm backend.
+
+Measures read_samples() throughput and latency percentiles across channel counts,
+FlexRMS mixes and per-call latencies, plus time-to-ready for start() and
+restart_device(). Results are written as JSON so runs can be compared between releases.
+
+    python benchmarks/bench_driver.py --output benchmark_results.json
+"""
+import argparse
+import datetime
+import itertools
+import json
+import logging
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from LabjackClient import LabJackT7Driver  # noqa: E402
+from LabjackClient.simulator import SimulatedLJM  # noqa: E402
+
+
+def percentiles(durations):
+    durations = np.asarray(durations, dtype=np.float64)
+    return {
+        "p50_ms": float(np.percentile(durations, 50) * 1e3),
+        "p99_ms": float(np.percentile(durations, 99) * 1e3),
+        "mean_ms": float(durations.mean() * 1e3),
+        "max_ms": float(durations.max() * 1e3),
+    }
+
+
+def make_driver(latency, num_channels, rms_fraction, flexrms_blocking):
+    backend = SimulatedLJM(latency=latency, flexrms_blocking=flexrms_blocking)
+    driver = LabJackT7Driver(backend=backend, voltage_range="10V")
+    driver.num_analog_inputs = num_channels
+    num_rms = int(round(num_channels * rms_fraction))
+    for channel in range(num_channels):
+        # 1 kHz signal so a 2 ms FlexRMS window always contains full periods
+        backend.set_waveform(channel, amplitude=1.0, frequency=1000.0)
+    return driver, num_rms
+
+
+def configure_rms(driver, num_rms):
+    with driver.configuration():
+        for channel in range(num_rms):
+            driver.set_channel_rms(channel, True, num_scans=200, scan_time_microseconds=2000)
+
+
+def bench_read(latency, num_channels, rms_fraction, scans, flexrms_blocking):
+    driver, num_rms = make_driver(latency, num_channels, rms_fraction, flexrms_blocking)
+    driver.start()
+    configure_rms(driver, num_rms)
+    driver.read_samples()  # Warm up the address table and read plan
+
+    durations = []
+    started = time.perf_counter()
+    for _ in range(scans):
+        t0 = time.perf_counter()
+        driver.read_samples()
+        durations.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    driver.close()
+
+    result = {
+        "benchmark": "read_samples",
+        "latency_ms": latency * 1e3,
+        "channels": num_channels,
+        "rms_channels": num_rms,
+        "scans": scans,
+        "scans_per_sec": scans / elapsed,
+    }
+    result.update(percentiles(durations))
+    return result
+
+
+def bench_lifecycle(latency, num_channels, rms_fraction, repeats, flexrms_blocking):
+    driver, num_rms = make_driver(latency, num_channels, rms_fraction, flexrms_blocking)
+    start_durations = []
+    restart_durations = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        driver.start()
+        configure_rms(driver, num_rms)
+        start_durations.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        driver.restart_device()
+        restart_durations.append(time.perf_counter() - t0)
+        driver.close()
+
+    results = []
+    for name, durations in (("start", start_durations), ("restart_device", restart_durations)):
+        result = {
+            "benchmark": name,
+            "latency_ms": latency * 1e3,
+            "channels": num_channels,
+            "rms_channels": num_rms,
+            "repeats": repeats,
+        }
+        result.update(percentiles(durations))
+        results.append(result)
+    return results
+
+
+def parse_list(text, convert):
+    return [convert(item) for item in text.split(",") if item]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file to write results to")
+    parser.add_argument("--channels", default="4,8,16", help="Comma-separated channel counts")
+    parser.add_argument("--rms-fractions", default="0,0.5,1", help="Comma-separated fractions of FlexRMS channels")
+    parser.add_argument("--latencies-ms", default="0,0.5,2", help="Comma-separated per-call latencies in ms")
+    parser.add_argument("--scans", type=int, default=200, help="read_samples calls per configuration")
+    parser.add_argument("--repeats", type=int, default=10, help="start/restart cycles per configuration")
+    parser.add_argument("--flexrms-blocking", action="store_true",
+                        help="Make FlexRMS reads block for their scan time, as on the device")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+
+    results = []
+    for latency_ms, num_channels, rms_fraction in itertools.product(
+        parse_list(args.latencies_ms, float), parse_list(args.channels, int), parse_list(args.rms_fractions, float)
+    ):
+        latency = latency_ms / 1e3
+        read = bench_read(latency, num_channels, rms_fraction, args.scans, args.flexrms_blocking)
+        results.append(read)
+        print(
+            f"{'read_samples':<15}latency={latency_ms:>4}ms channels={num_channels:>2} rms={read['rms_channels']:>2}  "
+            f"{read['scans_per_sec']:>9.1f} scans/s  p50={read['p50_ms']:.3f}ms p99={read['p99_ms']:.3f}ms"
+        )
+        for lifecycle in bench_lifecycle(latency, num_channels, rms_fraction, args.repeats, args.flexrms_blocking):
+            results.append(lifecycle)
+            print(
+                f"{lifecycle['benchmark']:<15}latency={latency_ms:>4}ms channels={num_channels:>2} "
+                f"rms={lifecycle['rms_channels']:>2}  p50={lifecycle['p50_ms']:.3f}ms p99={lifecycle['p99_ms']:.3f}ms"
+            )
+
+    report = {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "arguments": vars(args),
+        "results": results,
+    }
+    with open(args.output, "w") as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,17 @@ setup(
     packages=find_packages(), 
     install_requires=[
         'labjack-ljm',
+        'numpy',
+        'pyyaml',
     ],
+    extras_require={
+        'parquet': ['pyarrow'],
+    },
+    entry_points={
+        'console_scripts': [
+            'labjack-run=LabjackClient.runner:main',
+        ],
+    },
     description='LabJack T7 driver package for Python',
     long_description=open('README.md').read(),
     long_description_content_type='text/markdown',
@@ -18,5 +28,5 @@ setup(
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.8',
 )
@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from LabjackClient import LabJackT7Driver  # noqa: E402
+from LabjackClient.simulator import SimulatedLJM  # noqa: E402
+
+
+@pytest.fixture
+def sim():
+    return SimulatedLJM(flexrms_blocking=False)
+
+
+@pytest.fixture
+def driver(sim):
+    driver = LabJackT7Driver(
+        backend=sim, voltage_range="10V", reconnect_options={"initial_backoff": 0.01, "jitter": 0.0}
+    )
+    driver.start()
+    yield driver
+    if driver.get_stream_status().get("running"):
+        driver.stop()
+    driver.stop_recording()
+    driver.stop_publishing()
+    driver.stop_aggregation()
+    driver.close()
+
+
+def wait_for(condition, timeout=5.0):
+    """
+    Poll condition() until it is true or timeout seconds pass; return its last value.
+    """
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
@@ -0,0 +1,108 @@
+import math
+
+import numpy as np
+import pytest
+
+from LabjackClient import Aggregator
+from LabjackClient.aggregation import parse_window
+
+
+@pytest.fixture
+def emitted():
+    return []
+
+
+def make_aggregator(emitted, windows=(1,), num_channels=2, **kwargs):
+    return Aggregator(
+        windows, num_channels, on_windows=lambda window, columns: emitted.append((window, columns)), **kwargs
+    )
+
+
+def test_parse_window():
+    assert parse_window(2) == 2.0
+    assert parse_window("500ms") == 0.5
+    assert parse_window("5min") == 300.0
+    assert parse_window("1h") == 3600.0
+    assert parse_window("10Hz") == pytest.approx(0.1)
+
+
+def test_window_is_emitted_once_a_later_scan_arrives(emitted):
+    aggregator = make_aggregator(emitted)
+    aggregator.write([100.0, 100.5, 100.999], [[1.0, 2.0, 3.0], [-1.0, -1.0, -1.0]])
+    assert emitted == []
+
+    # A scan exactly on the boundary starts the next window
+    aggregator.write([101.0], [[10.0], [0.0]])
+    assert len(emitted) == 1
+    window, columns = emitted[0]
+    assert window == 1.0
+    assert columns["window_start"] == [100.0]
+    assert columns["window_end"] == [101.0]
+    assert columns["AIN0_count"] == [3]
+    assert columns["AIN0_mean"] == [pytest.approx(2.0)]
+    assert columns["AIN0_min"] == [1.0]
+    assert columns["AIN0_max"] == [3.0]
+    assert columns["AIN0_rms"] == [pytest.approx(math.sqrt(14 / 3))]
+    assert columns["AIN1_rms"] == [pytest.approx(1.0)]
+
+
+def test_windows_without_scans_are_not_emitted(emitted):
+    aggregator = make_aggregator(emitted)
+    aggregator.write([10.2, 10.7, 14.1, 14.2, 17.0], np.ones((2, 5)))
+    starts = [start for _, columns in emitted for start in columns["window_start"]]
+    assert starts == [10.0, 14.0]
+    aggregator.flush()
+    assert emitted[-1][1]["window_start"] == [17.0]
+
+
+def test_nan_samples_are_left_out(emitted):
+    aggregator = make_aggregator(emitted)
+    aggregator.write([0.1, 0.2, 0.3], [[np.nan, 2.0, 4.0], [np.nan, np.nan, np.nan]])
+    aggregator.flush()
+    columns = emitted[0][1]
+    assert columns["AIN0_count"] == [2]
+    assert columns["AIN0_mean"] == [pytest.approx(3.0)]
+    assert columns["AIN1_count"] == [0]
+    assert math.isnan(columns["AIN1_mean"][0])
+    assert math.isnan(columns["AIN1_min"][0])
+
+
+def test_blocks_continue_the_open_window(emitted):
+    aggregator = make_aggregator(emitted, num_channels=1)
+    aggregator.write([7.1, 7.2], [[1.0, 2.0]])
+    aggregator.write([7.9, 8.0, 8.5], [[3.0, 4.0, 5.0]])
+    aggregator.flush()
+    assert [columns["window_start"] for _, columns in emitted] == [[7.0], [8.0]]
+    assert [columns["AIN0_count"] for _, columns in emitted] == [[3], [2]]
+
+
+def test_resolutions_are_aligned(emitted):
+    aggregator = make_aggregator(emitted, windows=("1s", "10s"), channels=[1])
+    timestamps = np.arange(0.0, 20.0, 0.25)
+    aggregator.write(timestamps, np.vstack((np.zeros_like(timestamps), timestamps)))
+    aggregator.flush()
+
+    by_window = {}
+    for window, columns in emitted:
+        by_window.setdefault(window, []).extend(columns["window_start"])
+        assert "AIN0_mean" not in columns
+    assert by_window[1.0] == [float(start) for start in range(20)]
+    assert by_window[10.0] == [0.0, 10.0]
+    assert aggregator.windows_emitted == {1.0: 20, 10.0: 2}
+    assert aggregator.scans_written == len(timestamps)
+
+
+def test_rows_and_scaling(emitted):
+    aggregator = make_aggregator(emitted, num_channels=3)
+    aggregator.write([0.0, 0.5], [[1.0, 3.0]], scaling_factors=[2.0], rows=[2])
+    aggregator.flush()
+    columns = emitted[0][1]
+    assert columns["AIN2_mean"] == [pytest.approx(4.0)]
+    assert columns["AIN0_count"] == [0]
+
+
+def test_invalid_windows():
+    with pytest.raises(ValueError):
+        Aggregator([0], 1)
+    with pytest.raises(ValueError):
+        Aggregator([], 1)
@@ -0,0 +1,82 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from LabjackClient import AsyncLabJackT7Driver
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_read_samples_does_not_block_the_loop(sim, driver):
+    sim.latency = 0.05
+    sim.set_waveform(0, dc=1.5)
+    labjack = AsyncLabJackT7Driver(driver)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        values = await labjack.read_samples()
+        task.cancel()
+        return values, ticks
+
+    values, ticks = run(main())
+    assert values["AIN0"] == pytest.approx(1.5)
+    assert ticks > 3
+
+
+def test_configuration_sends_one_batch(sim, driver):
+    labjack = AsyncLabJackT7Driver(driver)
+    calls = sim.call_counts.get("eWriteAddresses", 0)
+
+    async def main():
+        async with labjack.configuration():
+            await labjack.set_range(0, "1V")
+            await labjack.configure_measurement_type(0, "differential", 1)
+            assert sim.call_counts.get("eWriteAddresses", 0) == calls
+
+    run(main())
+    assert sim.call_counts["eWriteAddresses"] == calls + 1
+
+
+def test_configuration_discards_on_error(sim, driver):
+    labjack = AsyncLabJackT7Driver(driver)
+    calls = sim.call_counts.get("eWriteAddresses", 0)
+
+    async def main():
+        async with labjack.configuration():
+            await labjack.set_range(0, "1V")
+            raise RuntimeError("abort")
+
+    with pytest.raises(RuntimeError):
+        run(main())
+    assert sim.call_counts.get("eWriteAddresses", 0) == calls
+    driver.begin()
+    driver.set_range(0, "1V")
+    assert driver.commit() == 1
+
+
+def test_stream_iteration_ends_when_the_stream_stops(sim):
+    sim.set_waveform(1, dc=0.25)
+
+    async def main():
+        scans = 0
+        async with AsyncLabJackT7Driver(backend=sim, voltage_range="10V") as labjack:
+            await labjack.start_stream(1000, scans_per_read=50, channels=[1])
+            async for data in labjack.stream(poll_interval=0.05):
+                assert np.allclose(data["AIN1"], 0.25)
+                scans += len(data["AIN1"])
+                if scans >= 200:
+                    await labjack.stop()
+        return scans
+
+    assert run(asyncio.wait_for(main(), timeout=10)) >= 200
@@ -0,0 +1,169 @@
+import logging
+import math
+import time
+
+import pytest
+from labjack import ljm
+
+from conftest import wait_for
+
+
+def test_read_samples_reads_all_channels_in_one_round_trip(sim, driver):
+    sim.set_waveform(0, dc=1.5)
+    driver.set_scaling_factor(0, 2)
+    calls = sim.call_counts.get("eReadAddresses", 0)
+
+    values = driver.read_samples()
+
+    assert sim.call_counts["eReadAddresses"] == calls + 1
+    assert list(values) == [f"AIN{channel}" for channel in range(16)]
+    assert values["AIN0"] == pytest.approx(3.0)
+
+
+def test_flexrms_period_error_drops_only_the_failing_channel(sim, driver):
+    sim.set_waveform(0, amplitude=1.0, frequency=60)
+    sim.set_waveform(1, dc=0.5)
+    with driver.configuration():
+        driver.set_channel_rms(0, True, scan_time_microseconds=50000)
+        driver.set_channel_rms(2, True)  # No AC signal: the device cannot find a period
+    calls = sim.call_counts.get("eReadAddresses", 0)
+
+    values = driver.read_samples()
+
+    # The batch is re-issued once without AIN2 instead of falling back to one read per channel
+    assert sim.call_counts["eReadAddresses"] == calls + 2
+    assert sim.call_counts.get("eReadAddress", 0) == 0
+    assert values["AIN2"] == 0
+    assert values["AIN0"] == pytest.approx(1 / math.sqrt(2))
+    assert values["AIN1"] == pytest.approx(0.5)
+
+
+def test_commit_skips_registers_that_already_match(sim, driver):
+    driver.begin()
+    driver.set_range(0, "1V")
+    assert driver.commit() == 1
+
+    driver.begin()
+    driver.set_range(0, "1V")
+    driver.set_range(1, "10V")  # Applied by start()
+    assert driver.commit() == 0
+
+
+def test_nested_transactions_are_sent_in_one_batch(sim, driver):
+    calls = sim.call_counts.get("eWriteAddresses", 0)
+    with driver.configuration():
+        driver.set_range(0, "1V")
+        with driver.configuration():
+            driver.configure_measurement_type(0, "differential", 1)
+        assert sim.call_counts.get("eWriteAddresses", 0) == calls
+    assert sim.call_counts["eWriteAddresses"] == calls + 1
+
+
+def test_configuration_discards_staged_writes_on_error(sim, driver):
+    calls = sim.call_counts.get("eWriteAddresses", 0)
+    with pytest.raises(RuntimeError):
+        with driver.configuration():
+            driver.set_range(0, "1V")
+            raise RuntimeError("abort")
+
+    assert sim.call_counts.get("eWriteAddresses", 0) == calls
+    driver.begin()
+    driver.set_range(0, "1V")
+    assert driver.commit() == 1
+
+
+def test_connection_loss_returns_nan_scans_and_reconnects(sim, driver):
+    sim.disconnect()
+
+    values = driver.read_samples()
+    assert all(math.isnan(value) for value in values.values())
+    assert not driver.supervisor.connected
+    # Scans requested during the outage are NaN without touching the device
+    assert all(math.isnan(value) for value in driver.read_samples().values())
+
+    sim.reconnect()
+    assert wait_for(lambda: driver.supervisor.connected)
+    assert not math.isnan(driver.read_samples()["AIN0"])
+
+    metrics = driver.get_connection_metrics()
+    assert metrics["reconnect_count"] == 1
+    assert metrics["missing_scans"] == 2
+    assert len(metrics["gap_intervals"]) == 1
+    start, end = metrics["gap_intervals"][0]
+    assert start <= end
+
+
+def test_request_errors_cost_the_scan_without_reconnecting(sim, driver):
+    sim.inject_error("AIN3", "INVALID_ADDRESS", error_code=ljm.errorcodes.INVALID_ADDRESS)
+
+    values = driver.read_samples()
+
+    assert all(math.isnan(value) for value in values.values())
+    assert driver.supervisor.connected
+    assert driver.get_connection_metrics()["reconnect_count"] == 0
+    assert not math.isnan(driver.read_samples()["AIN3"])
+
+
+def test_reconnect_waits_for_an_open_configuration(sim, driver):
+    range_address = sim._resolve("AIN1_RANGE")[0]
+    sim.disconnect()
+    driver.read_samples()  # Starts the background reconnect
+
+    with pytest.raises(RuntimeError):
+        with driver.configuration():
+            sim.registers.clear()  # The device was power-cycled during the outage
+            sim.reconnect()
+            time.sleep(0.1)  # Reconnect attempts are due, but wait for this block
+            assert not driver.supervisor.connected
+            raise RuntimeError("abort")
+
+    assert wait_for(lambda: driver.supervisor.connected)
+    assert sim.registers[range_address] == 10.0
+
+
+def test_restart_inside_an_open_transaction_configures_the_device(sim, driver):
+    driver.begin()
+    driver.set_range(0, "1V")
+    sim.registers.clear()
+
+    driver._reopen()  # As the supervisor does after a connection loss
+
+    assert sim.registers[sim._resolve("AIN0_RANGE")[0]] == 1.0
+    assert sim.registers[sim._resolve("AIN1_RANGE")[0]] == 10.0
+    assert driver.commit() == 0  # Already applied by the restart
+
+
+def trace_lines(caplog):
+    return [record.getMessage() for record in caplog.records if record.getMessage().startswith("Scan ")]
+
+
+def test_sample_trace_is_off_by_default(driver, caplog):
+    with caplog.at_level(logging.DEBUG, logger="LabjackClient.LabJackT7Driver"):
+        for _ in range(3):
+            driver.read_samples()
+    assert trace_lines(caplog) == []
+
+
+def test_sample_trace_logs_every_nth_scan(sim, driver, caplog):
+    sim.set_waveform(0, dc=0.5)
+    driver.set_scaling_factor(0, 2)
+    driver.enable_sample_trace(every=3)
+    with caplog.at_level(logging.DEBUG, logger="LabjackClient.LabJackT7Driver"):
+        for _ in range(7):
+            driver.read_samples()
+        driver.disable_sample_trace()
+        driver.read_samples()
+
+    lines = trace_lines(caplog)
+    assert [line.split(":")[0] for line in lines] == ["Scan 3", "Scan 6"]
+    assert "AIN0=1.0" in lines[0]
+
+
+def test_sample_trace_is_rate_limited(driver, caplog):
+    driver.enable_sample_trace(min_interval=60)
+    with caplog.at_level(logging.DEBUG, logger="LabjackClient.LabJackT7Driver"):
+        for _ in range(5):
+            driver.read_samples()
+    assert len(trace_lines(caplog)) == 1
+    with pytest.raises(ValueError):
+        driver.enable_sample_trace(every=0)
@@ -0,0 +1,71 @@
+import math
+
+import numpy as np
+import pytest
+
+from LabjackClient.host_statistics import WindowStatistics, compute_statistics
+
+from conftest import wait_for
+
+
+def sine(num_samples, amplitude=1.0, frequency=60.0, scan_rate=6000.0, phase=0.3, dc=0.0):
+    return dc + amplitude * np.sin(2 * np.pi * frequency * np.arange(num_samples) / scan_rate + phase)
+
+
+def test_period_rms_of_an_exact_sine():
+    # 10.25 periods: the plain RMS includes a partial period, the period-aligned one does not
+    stats = compute_statistics(sine(1025))
+    assert stats["period_rms"][0] == pytest.approx(1 / math.sqrt(2), abs=1e-12)
+    assert stats["periods"][0] == 9
+    assert abs(stats["rms"][0] - 1 / math.sqrt(2)) > abs(stats["period_rms"][0] - 1 / math.sqrt(2))
+
+
+def test_period_rms_includes_dc():
+    stats = compute_statistics(sine(1000, amplitude=2.0, dc=0.5))
+    assert stats["period_rms"][0] == pytest.approx(math.sqrt(0.25 + 2.0), abs=1e-12)
+
+
+def test_basic_statistics_ignore_nan():
+    data = np.array([[1.0, -3.0, np.nan, 2.0], [np.nan] * 4])
+    stats = compute_statistics(data)
+    assert stats["count"].tolist() == [3, 0]
+    assert stats["mean"][0] == pytest.approx(0.0)
+    assert stats["rms"][0] == pytest.approx(math.sqrt(14 / 3))
+    assert stats["min"][0] == -3.0
+    assert stats["max"][0] == 2.0
+    assert stats["peak"][0] == 3.0
+    assert all(math.isnan(stats[name][1]) for name in ("mean", "rms", "min", "max", "peak", "period_rms"))
+
+
+def test_period_rms_needs_two_rising_crossings():
+    starting_low = sine(250, phase=-np.pi / 2)  # Rising crossings at samples 25, 125 and 225
+    stats = compute_statistics(np.vstack((np.linspace(0, 1, 120), starting_low[:120])))
+    assert stats["periods"].tolist() == [0, 0]
+    assert np.isnan(stats["period_rms"]).all()
+
+    stats = compute_statistics(starting_low)
+    assert stats["periods"][0] == 2
+    assert stats["period_rms"][0] == pytest.approx(1 / math.sqrt(2), abs=1e-12)
+
+
+def test_window_statistics_keep_the_newest_samples():
+    window = WindowStatistics([3, 5], scan_rate=1000, window_seconds=0.01)
+    assert window.window_scans == 10
+    window.update(np.vstack((np.zeros(25), np.ones(25))))
+    window.update({"AIN3": np.full(4, 2.0), "AIN5": np.full(4, 3.0)})
+    stats = window.compute()
+    assert window.total_scans == 29
+    assert stats["AIN3"]["mean"] == pytest.approx(0.8)
+    assert stats["AIN5"]["max"] == 3.0
+
+
+def test_read_samples_reports_host_period_rms(sim, driver):
+    sim.set_waveform(0, amplitude=2.0, frequency=60)
+    sim.set_waveform(1, dc=0.25)
+    driver.set_channel_rms(0, True)
+    driver.start_host_statistics(6000, window_seconds=0.1, scans_per_read=100)
+
+    assert wait_for(lambda: driver.get_stream_status()["scans_read"] >= 600)
+    values = driver.read_samples()
+    assert values["AIN0"] == pytest.approx(math.sqrt(2), abs=1e-9)
+    assert values["AIN1"] == pytest.approx(0.25)
@@ -0,0 +1,84 @@
+import math
+
+import pytest
+from labjack import ljm
+
+from LabjackClient import Instrumentation, LabJackT7Driver
+from LabjackClient.instrumentation import InstrumentedLJM, LatencyHistogram
+
+
+def test_histogram_quantiles_and_snapshot():
+    histogram = LatencyHistogram(buckets=(0.001, 0.01, 0.1))
+    for duration in (0.0005, 0.002, 0.003, 0.004, 0.5):
+        histogram.record(duration)
+
+    assert histogram.quantile(0.2) == 0.001
+    assert histogram.quantile(0.5) == 0.01
+    assert histogram.quantile(1.0) == 0.5  # +Inf bucket reports the max
+    assert math.isnan(LatencyHistogram().quantile(0.5))
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 5
+    assert snapshot["sum"] == pytest.approx(0.5095)
+    assert snapshot["buckets"] == [(0.001, 1), (0.01, 4), (0.1, 4), (float("inf"), 5)]
+
+
+def test_prometheus_text_format():
+    instrumentation = Instrumentation(buckets=(0.01, 0.1), labels={"serial": "470012345"})
+    instrumentation.record_call("eReadAddresses", 0.005)
+    instrumentation.record_channels([0, 1], 0.05)
+    instrumentation.record_scan(0.2)
+    instrumentation.record_error(ljm.errorcodes.INVALID_ADDRESS)
+
+    lines = instrumentation.to_prometheus().splitlines()
+    assert "# TYPE labjack_ljm_call_duration_seconds histogram" in lines
+    assert (
+        'labjack_ljm_call_duration_seconds_bucket{serial="470012345",operation="eReadAddresses",le="0.01"} 1' in lines
+    )
+    assert 'labjack_channel_read_duration_seconds_count{serial="470012345",channel="AIN1"} 1' in lines
+    assert 'labjack_scan_duration_seconds_bucket{serial="470012345",le="0.1"} 0' in lines
+    assert 'labjack_scan_duration_seconds_bucket{serial="470012345",le="+Inf"} 1' in lines
+    assert f'labjack_ljm_errors_total{{serial="470012345",code="{ljm.errorcodes.INVALID_ADDRESS}"}} 1' in lines
+
+
+def test_instrumented_ljm_times_calls_and_passes_the_rest_through(sim):
+    instrumentation = Instrumentation()
+    wrapped = InstrumentedLJM(sim, instrumentation)
+    assert wrapped.constants is sim.constants
+    assert wrapped.call_counts is sim.call_counts
+
+    handle = wrapped.openS("T7", "ANY", "ANY")
+    sim.inject_error("AIN0", "INVALID_ADDRESS", error_code=ljm.errorcodes.INVALID_ADDRESS)
+    with pytest.raises(ljm.LJMError):
+        wrapped.eReadName(handle, "AIN0")
+    wrapped.close(handle)
+
+    snapshot = instrumentation.snapshot()
+    assert set(snapshot["calls"]) == {"openS", "eReadName", "close"}
+    assert snapshot["calls"]["eReadName"]["count"] == 1
+    assert snapshot["errors"] == {ljm.errorcodes.INVALID_ADDRESS: 1}
+
+
+def test_driver_records_calls_channels_scans_and_errors(sim, driver):
+    driver.instrumentation.reset()
+    sim.inject_error("AIN3", "INVALID_ADDRESS", error_code=ljm.errorcodes.INVALID_ADDRESS)
+    for _ in range(3):
+        driver.read_samples()
+
+    snapshot = driver.instrumentation.snapshot()
+    assert snapshot["calls"]["eReadAddresses"]["count"] == 3
+    # The failed scan is counted as an error, not as a scan or channel latency
+    assert snapshot["scans"]["count"] == 2
+    assert snapshot["channels"]["AIN0"]["count"] == 2
+    assert snapshot["errors"][ljm.errorcodes.INVALID_ADDRESS] == 1
+    assert f'serial="{sim.serial_number}"' in driver.instrumentation.to_prometheus()
+
+
+def test_instrumentation_can_be_disabled(sim):
+    driver = LabJackT7Driver(backend=sim, instrument=False)
+    driver.start()
+    try:
+        driver.read_samples()
+        assert driver.instrumentation is None
+        assert driver.ljm is sim
+    finally:
+        driver.close()
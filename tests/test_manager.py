@@ -0,0 +1,59 @@
+import pytest
+
+from LabjackClient import LabJackManager
+from LabjackClient.manager import parse_channel_number
+from LabjackClient.simulator import SimulatedLJM
+
+
+def make_hardware():
+    return [
+        {"name": "LabJack", "IP": "10.0.0.1", "Channels": {"Channel 0": {"name": "V1", "scaling_factor": 2}}},
+        {"name": "LabJack", "IP": "10.0.0.2", "Channels": {
+            "Channel 2": {"name": "V2", "type": "differential", "negative_channel": 3},
+        }},
+        {"name": "LabJack_aux", "IP": "10.0.0.3", "Channels": {"Channel 1": {}}},
+        {"name": "Chronos", "IP": "10.0.0.4"},
+    ]
+
+
+@pytest.fixture
+def manager():
+    sim = SimulatedLJM(latency=0.05, flexrms_blocking=False)
+    sim.set_waveform(0, dc=0.5)
+    manager = LabJackManager.from_config({"hardware": make_hardware()}, backend=sim)
+    manager.start()
+    yield manager
+    manager.close()
+
+
+def test_parse_channel_number():
+    assert parse_channel_number("Channel 12") == 12
+    assert parse_channel_number(3) == 3
+
+
+def test_devices_are_named_and_configured(manager):
+    assert list(manager.devices) == ["LabJack_10.0.0.1", "LabJack_10.0.0.2", "LabJack_aux"]
+    assert manager.channel_names == {
+        "LabJack_10.0.0.1": {0: "V1"}, "LabJack_10.0.0.2": {2: "V2"}, "LabJack_aux": {1: "AIN1"},
+    }
+    assert manager.devices["LabJack_10.0.0.2"].channel_negative_channels[2] == 3
+    assert manager.devices["LabJack_10.0.0.1"].channel_scaling_factors[0] == 2
+
+
+def test_devices_are_read_concurrently(manager):
+    frame = manager.read_samples()
+    assert set(frame) == {"timestamp", "LabJack_10.0.0.1/V1", "LabJack_10.0.0.2/V2", "LabJack_aux/AIN1"}
+    assert frame["LabJack_10.0.0.1/V1"] == pytest.approx(1.0)
+    # Three devices with 50 ms per round trip take about one round trip, not three
+    assert manager.last_scan_duration < 0.12
+    assert set(manager.last_device_durations) == set(manager.devices)
+
+
+def test_failed_device_reads_as_none(manager, monkeypatch):
+    def fail():
+        raise RuntimeError("device gone")
+
+    monkeypatch.setattr(manager.devices["LabJack_aux"], "read_samples", fail)
+    frame = manager.read_samples()
+    assert frame["LabJack_aux/AIN1"] is None
+    assert frame["LabJack_10.0.0.1/V1"] == pytest.approx(1.0)
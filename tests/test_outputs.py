@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from LabjackClient import LabJackT7Driver, RecordingReader, ReplayLJM, SharedScanSubscriber
+from LabjackClient.recording import EndOfRecording
+
+from conftest import wait_for
+
+
+def test_stream_start_and_stop(sim, driver):
+    sim.set_waveform(0, dc=1.0)
+    driver.set_scaling_factor(0, 3)
+
+    rate = driver.start_stream(1000, scans_per_read=50, channels=[0, 1])
+    assert rate == 1000
+    with pytest.raises(RuntimeError):
+        driver.start_stream(1000)
+
+    assert wait_for(lambda: driver.get_stream_status()["scans_read"] >= 100)
+    data = driver.read_stream(timeout=1)
+    assert set(data) == {"AIN0", "AIN1"}
+    assert len(data["AIN0"]) >= 100
+    assert np.allclose(data["AIN0"], 3.0)
+
+    driver.stop()
+    status = driver.get_stream_status()
+    assert not status["running"]
+    assert status["error"] is None
+
+
+def test_stream_scans_are_stamped_from_the_scan_clock(sim, driver):
+    buffer = driver.enable_buffer(10000)
+    driver.start_stream(1000, scans_per_read=25, channels=[0, 3])
+
+    assert wait_for(lambda: buffer.total_written >= 200)
+    driver.stop()
+    timestamps, data = buffer.latest()
+    expected = driver.stream_start_time + np.arange(len(timestamps)) / 1000
+    assert np.array_equal(timestamps, expected)
+    assert np.all(np.diff(timestamps) > 0)
+    assert np.isnan(data[1]).all()  # Not streamed
+
+
+def test_recording_while_streaming(sim, driver, tmp_path):
+    sim.set_waveform(1, dc=0.25)
+    path = tmp_path / "scans.ljrec"
+    driver.start_stream(1000, scans_per_read=50, channels=[1])
+    driver.start_recording(str(path))
+
+    assert wait_for(lambda: driver.recorder.records_written >= 100)
+    driver.stop_recording()
+    assert driver.recorder is None
+    assert driver.get_stream_status()["running"]
+    driver.stop()
+
+    reader = RecordingReader(str(path))
+    assert len(reader) >= 100
+    assert np.allclose(reader.channel(1), 0.25)
+    assert np.isnan(reader.channel(0)).all()  # Not streamed
+    assert np.all(np.diff(reader.timestamps) >= 0)
+
+
+def test_publishing_while_streaming(sim, driver):
+    sim.set_waveform(2, dc=-0.5)
+    driver.start_stream(1000, scans_per_read=50, channels=[2])
+    publisher = driver.start_publishing(1000)
+    subscriber = SharedScanSubscriber(publisher.name)
+    try:
+        timestamps, data, cursor, lost = subscriber.read_since(0, timeout=2)
+        assert len(timestamps) > 0
+        assert cursor == len(timestamps) + lost
+        assert np.allclose(data[2], -0.5)
+
+        driver.stop_publishing()
+        assert subscriber.closed
+        assert driver.get_stream_status()["running"]
+    finally:
+        subscriber.close()
+
+
+def test_replay_ends_with_end_of_recording(sim, driver, tmp_path):
+    sim.set_waveform(0, dc=1.25)
+    sim.set_waveform(5, dc=-2.0)
+    driver.set_scaling_factor(5, 10)
+    path = str(tmp_path / "scans.ljrec")
+    driver.start_recording(path)
+    recorded = [driver.read_samples() for _ in range(20)]
+    driver.stop_recording()
+
+    reader = RecordingReader(path)
+    replay = LabJackT7Driver(backend=ReplayLJM(reader), reconnect_options={"initial_backoff": 0.01})
+    replay.start()
+    try:
+        reader.apply_channel_config(replay)
+        replayed = [replay.read_samples() for _ in range(len(recorded))]
+        with pytest.raises(EndOfRecording):
+            replay.read_samples()
+        assert replay.get_connection_metrics()["reconnect_count"] == 0
+        assert replay.supervisor.connected
+    finally:
+        replay.close()
+
+    for original, copy in zip(recorded, replayed):
+        assert copy["AIN0"] == pytest.approx(original["AIN0"])
+        assert copy["AIN5"] == pytest.approx(original["AIN5"], rel=1e-6)
@@ -0,0 +1,80 @@
+import threading
+
+import numpy as np
+import pytest
+
+from LabjackClient import ScanRingBuffer
+
+
+def test_latest_returns_the_newest_samples_across_the_wrap():
+    buffer = ScanRingBuffer(4, 2)
+    buffer.write([0.0, 1.0, 2.0], [[0, 1, 2], [10, 11, 12]])
+    buffer.write([3.0, 4.0, 5.0], [[3, 4, 5], [13, 14, 15]])
+
+    timestamps, data = buffer.latest()
+    assert len(buffer) == 4
+    assert timestamps.tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert data.tolist() == [[2, 3, 4, 5], [12, 13, 14, 15]]
+    assert buffer.latest(2)[0].tolist() == [4.0, 5.0]
+    with pytest.raises(ValueError):
+        data[0, 0] = 1.0  # Read-only views
+
+
+def test_write_applies_scaling_and_rows():
+    buffer = ScanRingBuffer(8, 3)
+    buffer.write([0.0, 1.0], [[1.0, 2.0]], scaling_factors=[10.0], rows=[2])
+    data = buffer.latest()[1]
+    assert np.isnan(data[:2]).all()
+    assert data[2].tolist() == [10.0, 20.0]
+
+
+def test_write_longer_than_capacity_keeps_the_newest():
+    buffer = ScanRingBuffer(3, 1)
+    buffer.write(np.arange(10.0), [np.arange(10.0)])
+    assert buffer.total_written == 10
+    assert buffer.latest()[0].tolist() == [7.0, 8.0, 9.0]
+
+
+def test_read_since_reports_lost_samples():
+    buffer = ScanRingBuffer(4, 1)
+    buffer.write(np.arange(3.0), [np.arange(3.0)])
+    timestamps, _, cursor, lost = buffer.read_since(0)
+    assert (timestamps.tolist(), cursor, lost) == ([0.0, 1.0, 2.0], 3, 0)
+
+    buffer.write(np.arange(3.0, 9.0), [np.arange(3.0, 9.0)])
+    timestamps, _, cursor, lost = buffer.read_since(cursor, max_samples=3)
+    assert (timestamps.tolist(), cursor, lost) == ([5.0, 6.0, 7.0], 8, 2)
+
+
+def test_read_since_returns_copies_that_survive_the_wrap():
+    buffer = ScanRingBuffer(4, 1)
+    buffer.write(np.arange(4.0), [np.arange(4.0)])
+    timestamps, data, _, _ = buffer.read_since(0)
+
+    buffer.write(np.arange(4.0, 8.0), [np.arange(4.0, 8.0)])
+    assert timestamps.tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert data.tolist() == [[0.0, 1.0, 2.0, 3.0]]
+
+
+def test_read_since_waits_for_a_write():
+    buffer = ScanRingBuffer(4, 1)
+    timestamps, _, cursor, _ = buffer.read_since(0, timeout=0.01)
+    assert len(timestamps) == 0 and cursor == 0
+
+    writer = threading.Timer(0.05, buffer.write, ([1.0], [[2.0]]))
+    writer.start()
+    timestamps, data, cursor, _ = buffer.read_since(0, timeout=5)
+    writer.join()
+    assert (timestamps.tolist(), data.tolist(), cursor) == ([1.0], [[2.0]], 1)
+
+
+def test_driver_buffers_read_samples(sim, driver):
+    sim.set_waveform(4, dc=0.5)
+    driver.set_scaling_factor(4, 2)
+    buffer = driver.enable_buffer(16)
+    for _ in range(3):
+        driver.read_samples()
+    timestamps, data = buffer.latest()
+    assert len(timestamps) == 3
+    assert np.all(np.diff(timestamps) >= 0)
+    assert np.allclose(data[4], 1.0)
@@ -0,0 +1,131 @@
+import csv
+import os
+
+import pytest
+import yaml
+
+from LabjackClient.runner import AcquisitionRunner, validate_config
+
+
+def make_config(channels=None, voltage_range="10V", sampling_frequency="200Hz", output=None):
+    return {
+        "test_name": "run",
+        "sampling_frequency": sampling_frequency,
+        "output": output or {},
+        "hardware": [{
+            "name": "LabJack",
+            "IP": "10.0.0.1",
+            "Voltage_range": voltage_range,
+            "Channels": channels if channels is not None else {"Channel 0": {"name": "A", "scaling_factor": 2}},
+        }],
+    }
+
+
+def write_config(path, config):
+    mtime = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+    with open(path, "w") as config_file:
+        yaml.safe_dump(config, config_file)
+    # Make sure the change is visible even on filesystems with coarse timestamps
+    os.utime(path, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+
+
+@pytest.fixture
+def runner(sim, tmp_path):
+    path = str(tmp_path / "config.yaml")
+    write_config(path, make_config())
+    runner = AcquisitionRunner(path, backend=sim, output_dir=str(tmp_path), reload_interval=None, display=False)
+    runner.start()
+    yield runner
+    runner.close()
+
+
+def register(sim, name):
+    return sim.registers.get(sim._resolve(name)[0])
+
+
+def test_validate_config_reports_every_problem():
+    config = make_config({
+        "Channel 0": {"type": "differential"},
+        "Channel 1": {"RMS": "yes", "scaling_factor": "x"},
+        "Channel two": {},
+    }, voltage_range="3V", sampling_frequency="fast")
+    with pytest.raises(ValueError) as error:
+        validate_config(config)
+    message = str(error.value)
+    for text in ("sampling_frequency", "Voltage_range", "negative_channel", "RMS", "scaling_factor", "Channel two"):
+        assert text in message
+
+
+def test_reload_applies_channel_changes(sim, runner):
+    sim.set_waveform(1, dc=0.5)
+    write_config(runner.config_path, make_config({
+        "Channel 0": {"name": "A", "scaling_factor": 2},
+        "Channel 1": {"name": "B", "type": "differential", "negative_channel": 3, "scaling_factor": 4},
+    }, sampling_frequency="50Hz"))
+
+    assert runner.check_reload()
+    assert not runner.check_reload()  # Unchanged since
+    assert register(sim, "AIN1_NEGATIVE_CH") == 3
+    assert runner.driver.read_samples()["AIN1"] == pytest.approx(2.0)
+    assert runner.scheduler.rate_hz == 50
+    assert runner.reloads == 1
+
+
+def test_invalid_edit_keeps_the_running_config(runner):
+    config = runner.config
+    write_config(runner.config_path, make_config(voltage_range="42V"))
+    assert not runner.check_reload()
+    assert runner.config is config
+
+
+def test_reload_while_disconnected_is_retried(sim, runner):
+    sim.disconnect()
+    write_config(runner.config_path, make_config(voltage_range="1V"))
+
+    assert not runner.check_reload()
+    assert runner.config["device"]["voltage_range"] == "10V"
+    assert not runner.check_reload()  # Still failing, still no exception
+
+    sim.reconnect()
+    assert runner.check_reload()
+    assert runner.config["device"]["voltage_range"] == "1V"
+    assert register(sim, "AIN0_RANGE") == 1.0
+
+
+def test_run_survives_a_reload_while_disconnected(sim, runner):
+    runner.reload_interval = 0
+    sim.disconnect()
+    write_config(runner.config_path, make_config(voltage_range="1V"))
+
+    runner.run(max_iterations=10)
+    assert runner.count == 10
+
+
+def test_reload_adds_channel_columns_to_the_output(sim, tmp_path):
+    path = str(tmp_path / "config.yaml")
+    output = {"CSV": {"batch_size": 1}}
+    write_config(path, make_config(output=output))
+    runner = AcquisitionRunner(path, backend=sim, output_dir=str(tmp_path), reload_interval=None, display=False)
+    runner.start()
+    sink = runner.sinks[0]
+    try:
+        runner.scheduler.run(max_iterations=3)
+        sim.set_waveform(2, dc=0.75)
+        write_config(path, make_config({
+            "Channel 0": {"name": "A", "scaling_factor": 2},
+            "Channel 2": {"name": "B"},
+        }, output=output))
+        assert runner.check_reload()
+        runner.scheduler.run(max_iterations=6)
+    finally:
+        runner.close()
+
+    assert len(sink.files) == 2
+    tables = []
+    for file_path in sink.files:
+        with open(file_path, newline="") as csv_file:
+            tables.append(list(csv.DictReader(csv_file)))
+    assert list(tables[0][0]) == ["Timestamp", "time", "A"]
+    assert list(tables[1][0]) == ["Timestamp", "time", "A", "B"]
+    assert len(tables[0]) == len(tables[1]) == 3
+    assert all(float(row["B"]) == 0.75 for row in tables[1])
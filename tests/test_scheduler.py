@@ -0,0 +1,102 @@
+import time
+
+import pytest
+
+from LabjackClient import FixedRateScheduler
+from LabjackClient.scheduler import parse_frequency
+
+
+def slow_read(slow_calls, delay):
+    calls = []
+
+    def read():
+        calls.append(time.monotonic())
+        if len(calls) in slow_calls:
+            time.sleep(delay)
+        return len(calls)
+
+    return read
+
+
+def test_parse_frequency():
+    assert parse_frequency("5Hz") == 5.0
+    assert parse_frequency("2.5 kHz") == 2500.0
+    assert parse_frequency(10) == 10.0
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        FixedRateScheduler(lambda: None, "0Hz")
+    with pytest.raises(ValueError):
+        FixedRateScheduler(lambda: None, 10, policy="drop")
+
+
+def test_deadlines_do_not_drift():
+    deadlines = []
+    scheduler = FixedRateScheduler(
+        lambda: time.sleep(0.002), "100Hz", on_sample=lambda _, deadline: deadlines.append(deadline),
+        policy="catch_up",
+    )
+    scheduler.run(max_iterations=20)
+
+    stats = scheduler.get_stats()
+    assert stats["iterations"] == 20
+    assert [round((deadline - deadlines[0]) * 100, 9) for deadline in deadlines] == list(range(20))
+    assert stats["achieved_rate"] == pytest.approx(100, rel=0.2)
+
+
+def test_skip_policy_drops_missed_deadlines():
+    deadlines = []
+    scheduler = FixedRateScheduler(
+        slow_read({3}, 0.055), 50, on_sample=lambda _, deadline: deadlines.append(deadline), policy="skip"
+    )
+    scheduler.run(max_iterations=6)
+
+    stats = scheduler.get_stats()
+    assert stats["overruns"] == 1
+    assert stats["skipped_deadlines"] == 2
+    ticks = [round((deadline - deadlines[0]) * 50, 9) for deadline in deadlines]
+    assert ticks == [0, 1, 2, 5, 6, 7]
+
+
+def test_catch_up_policy_fires_every_deadline():
+    deadlines = []
+    scheduler = FixedRateScheduler(
+        slow_read({3}, 0.055), 50, on_sample=lambda _, deadline: deadlines.append(deadline), policy="catch_up"
+    )
+    scheduler.run(max_iterations=6)
+
+    stats = scheduler.get_stats()
+    assert stats["skipped_deadlines"] == 0
+    assert stats["overruns"] >= 1
+    assert stats["max_lateness"] >= 0.02
+    ticks = [round((deadline - deadlines[0]) * 50, 9) for deadline in deadlines]
+    assert ticks == list(range(6))
+
+
+def test_set_rate_applies_from_the_next_deadline():
+    deadlines = []
+
+    def on_sample(sample, deadline):
+        deadlines.append(deadline)
+        if sample == 3:
+            scheduler.set_rate("50Hz")
+
+    scheduler = FixedRateScheduler(slow_read(set(), 0), "100Hz", on_sample=on_sample, policy="catch_up")
+    scheduler.run(max_iterations=6)
+    gaps = [round((later - earlier) * 1000, 6) for earlier, later in zip(deadlines, deadlines[1:])]
+    assert gaps == [10, 10, 10, 20, 20]
+    assert scheduler.get_stats()["target_rate"] == 50
+
+
+def test_stop_ends_a_background_loop():
+    scheduler = FixedRateScheduler(lambda: None, 200)
+    scheduler.start()
+    with pytest.raises(RuntimeError):
+        scheduler.start()
+    time.sleep(0.05)
+    scheduler.stop()
+    iterations = scheduler.iterations
+    assert iterations > 0
+    time.sleep(0.02)
+    assert scheduler.iterations == iterations
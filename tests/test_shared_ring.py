@@ -0,0 +1,104 @@
+import threading
+import tracemalloc
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from LabjackClient import SharedScanPublisher, SharedScanSubscriber
+
+
+@pytest.fixture
+def publisher():
+    publisher = SharedScanPublisher(8, 2)
+    yield publisher
+    if publisher.data is not None:
+        publisher.close()
+
+
+def test_subscriber_reads_published_scans(publisher):
+    subscriber = SharedScanSubscriber(publisher.name)
+    try:
+        assert (subscriber.capacity, subscriber.num_channels) == (8, 2)
+        publisher.write([1.0, 2.0, 3.0], [[1, 2, 3], [4, 5, 6]])
+
+        timestamps, data, sequence = subscriber.latest(2)
+        assert timestamps.tolist() == [2.0, 3.0]
+        assert data.tolist() == [[2, 3], [5, 6]]
+        assert subscriber.is_valid(sequence)
+
+        timestamps, data, cursor, lost = subscriber.read_since(0, timeout=0)
+        assert (timestamps.tolist(), cursor, lost) == ([1.0, 2.0, 3.0], 3, 0)
+        del timestamps, data
+    finally:
+        subscriber.close()
+
+
+def test_subscriber_detects_overwritten_scans(publisher):
+    subscriber = SharedScanSubscriber(publisher.name)
+    try:
+        publisher.write(np.arange(4.0), np.zeros((2, 4)))
+        sequence = subscriber.latest()[2]
+        publisher.write(np.arange(4.0, 14.0), np.ones((2, 10)))
+        assert not subscriber.is_valid(sequence)
+
+        timestamps, _, cursor, lost = subscriber.read_since(4, timeout=0)
+        assert (timestamps[0], cursor, lost) == (6.0, 14, 2)
+        del timestamps
+    finally:
+        subscriber.close()
+
+
+def test_close_is_visible_to_subscribers(publisher):
+    subscriber = SharedScanSubscriber(publisher.name)
+    try:
+        publisher.close()
+        assert subscriber.closed
+        timestamps, _, cursor, _ = subscriber.read_since(0)  # Returns at once instead of waiting
+        assert len(timestamps) == 0 and cursor == 0
+        del timestamps
+    finally:
+        subscriber.close()
+
+
+def test_attaching_to_another_block_fails():
+    block = shared_memory.SharedMemory(create=True, size=4096)
+    try:
+        with pytest.raises(ValueError):
+            SharedScanSubscriber(block.name)
+    finally:
+        block.close()
+        block.unlink()
+
+
+def test_publisher_does_not_allocate_a_private_ring():
+    tracemalloc.start()
+    try:
+        publisher = SharedScanPublisher(1_000_000, 1)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    try:
+        assert peak < publisher.nbytes // 4
+    finally:
+        publisher.close()
+
+
+def test_concurrent_publishers_and_subscribers(publisher):
+    errors = []
+
+    def attach_and_create():
+        try:
+            for _ in range(20):
+                subscriber = SharedScanSubscriber(publisher.name)
+                subscriber.close()
+                SharedScanPublisher(4, 1).close()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=attach_and_create) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
@@ -0,0 +1,109 @@
+import csv
+import threading
+
+import pytest
+
+from LabjackClient import CSVSink, build_sinks
+
+from conftest import wait_for
+
+
+def read_csv(path):
+    with open(path, newline="") as csv_file:
+        return list(csv.DictReader(csv_file))
+
+
+class BlockedCSVSink(CSVSink):
+    """
+    CSVSink whose writer thread waits on an event before writing each batch.
+    """
+
+    def __init__(self, path, **kwargs):
+        self.gate = threading.Event()
+        super().__init__(path, **kwargs)
+
+    def _write_columns(self, columns):
+        self.gate.wait()
+        super()._write_columns(columns)
+
+
+def test_scans_are_batched_and_flushed_on_close(tmp_path):
+    sink = CSVSink(str(tmp_path / "run.csv"), batch_size=4)
+    for index in range(10):
+        sink.write({"Timestamp": index, "AIN0": index / 2})
+    sink.close()
+
+    assert sink.files == [str(tmp_path / "run_0000.csv")]
+    rows = read_csv(sink.files[0])
+    assert [float(row["AIN0"]) for row in rows] == [index / 2 for index in range(10)]
+    stats = sink.get_stats()
+    assert (stats["written_rows"], stats["written_batches"], stats["dropped_rows"]) == (10, 3, 0)
+
+
+def test_files_rotate_by_size(tmp_path):
+    sink = CSVSink(str(tmp_path / "run.csv"), buffer_size=1, batch_size=10, rotate_bytes=100)
+    for index in range(50):
+        sink.write({"Timestamp": index, "AIN0": 1.0})
+    sink.close()
+
+    assert len(sink.files) > 1
+    tables = [read_csv(path) for path in sink.files]
+    assert sum(len(table) for table in tables) == 50
+    assert all(list(table[0]) == ["Timestamp", "AIN0"] for table in tables)
+
+
+def test_files_rotate_when_the_columns_change(tmp_path):
+    sink = CSVSink(str(tmp_path / "run.csv"), batch_size=2)
+    for index in range(2):
+        sink.write({"Timestamp": index, "A": 1.0})
+    for index in range(2, 4):
+        sink.write({"Timestamp": index, "A": 1.0, "B": 2.0})
+    sink.close()
+
+    assert [list(read_csv(path)[0]) for path in sink.files] == [["Timestamp", "A"], ["Timestamp", "A", "B"]]
+
+
+def test_full_queue_drops_batches(tmp_path):
+    sink = BlockedCSVSink(str(tmp_path / "run.csv"), batch_size=1, max_queued_batches=1)
+    assert sink.write_batch({"AIN0": [1.0, 2.0]})
+    # Wait until the writer thread has taken the first batch and is blocked on the gate
+    assert wait_for(lambda: sink.get_stats()["queue_depth"] == 0)
+    assert sink.write_batch({"AIN0": [3.0]})
+    assert not sink.write_batch({"AIN0": [4.0, 5.0, 6.0]})
+
+    sink.gate.set()
+    sink.close()
+    stats = sink.get_stats()
+    assert (stats["dropped_batches"], stats["dropped_rows"], stats["written_rows"]) == (1, 3, 3)
+    assert [row["AIN0"] for row in read_csv(sink.files[0])] == ["1.0", "2.0", "3.0"]
+
+
+def test_build_sinks_skips_unsupported_outputs(tmp_path):
+    sinks = build_sinks({"CSV": {"batch_size": 5}, "InfluxDB": {}}, str(tmp_path / "run"))
+    try:
+        assert len(sinks) == 1
+        assert isinstance(sinks[0], CSVSink)
+        assert sinks[0].path == str(tmp_path / "run.csv")
+        assert sinks[0].batch_size == 5
+    finally:
+        for sink in sinks:
+            sink.close()
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_parquet_sink_writes_row_groups(tmp_path, file_format):
+    pa = pytest.importorskip("pyarrow")
+    from LabjackClient import ParquetSink
+
+    sink = ParquetSink(str(tmp_path / f"run.{file_format}"), file_format=file_format, batch_size=3)
+    for index in range(7):
+        sink.write({"Timestamp": float(index), "AIN0": index / 2})
+    sink.close()
+
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(sink.files[0])
+    else:
+        table = pa.ipc.open_file(sink.files[0]).read_all()
+    assert table.column_names == ["Timestamp", "AIN0"]
+    assert table.column("AIN0").to_pylist() == [index / 2 for index in range(7)]